@@ -1,6 +1,6 @@
 import json
 from pathlib import Path
-from tax import marginal_rate_table_by_input, marginal_rate_table_by_tag
+from tax import marginal_rate_rows_by_input, marginal_rate_rows_by_tag
 
 BASE_DIR = Path(__file__).resolve().parent
 PRIVATE_DIR = BASE_DIR.parent / 'private'
@@ -20,12 +20,13 @@ def main(year, mode):
     inputs = load_inputs(year)
     policy = load_policy(year)
     if mode == 'input':
-        table = marginal_rate_table_by_input(inputs, policy)
+        rows = marginal_rate_rows_by_input(inputs, policy)
     elif mode == 'tag':
-        table = marginal_rate_table_by_tag(inputs, policy)
+        rows = marginal_rate_rows_by_tag(inputs, policy)
     else:
         raise ValueError(f"Unsupported mode '{mode}'. Use 'input' or 'tag'.")
-    print(table)
+    for row in rows:
+        print(row)
 
 # LEAVE THESE HARD CODED!
 year = 2024
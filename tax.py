@@ -4,13 +4,33 @@ Federal Form 1040 calculations for tax year 2024.
 This module implements pure functions to compute line items from Form 1040.
 """
 
+import sys
+from bisect import bisect_right
 from collections import defaultdict
-from decimal import Decimal, ROUND_HALF_UP
+from collections.abc import Iterator
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from itertools import chain
+from operator import itemgetter
+from pathlib import Path
+from typing import NamedTuple
 
 _COMPUTE_CHECKS_ENABLED = False
 _COMPUTE_CHECKS_EXPECTED: dict | None = None
 _COMPUTE_CHECKS_CONTEXT: str | None = None
 
+# Quantization exponent for whole-dollar rounding, built once at import.
+_WHOLE_DOLLAR = Decimal('1')
+# Shared zero for sums, clamps and early returns; Decimal is immutable, so a
+# single instance can be returned from any function.
+_ZERO = Decimal('0')
+# Exact one-half; multiplying by it gives the same value as dividing by 2
+# without going through Decimal division.
+_HALF = Decimal('0.5')
+# Quantization exponent for the 4-decimal ratios on IT-112-R and IT-219.
+_FOUR_PLACES = Decimal('0.0001')
+# QBI deduction rate applied to Section 199A dividends (Form 1040 line 13).
+_SECTION_199A_DIVIDENDS_RATE = Decimal('0.20')
+
 
 def round_to_dollars(amount: Decimal) -> Decimal:
     """
@@ -24,7 +44,9 @@ def round_to_dollars(amount: Decimal) -> Decimal:
     Returns:
         Amount rounded to nearest dollar
     """
-    return amount.quantize(Decimal('1'), rounding=ROUND_HALF_UP)
+    # Rounding mode is passed positionally: keyword parsing is a measurable
+    # share of quantize's cost on already-whole amounts.
+    return amount.quantize(_WHOLE_DOLLAR, ROUND_HALF_UP)
 
 
 def build_inputs_index(inputs: dict | list[dict]) -> dict:
@@ -36,17 +58,110 @@ def build_inputs_index(inputs: dict | list[dict]) -> dict:
     - flat list[dict] (legacy)
 
     Returns:
-        dict with keys: by_tag
+        dict with keys: by_tag, totals (Decimal sum per tag), amounts_by_tag
+        (parsed Decimal amounts per tag, in by_tag order). Each item's Amount
+        is parsed once, however many tags it carries; the input items are
+        not modified.
     """
     by_tag: dict[str, list[dict]] = defaultdict(list)
+    amounts_by_tag: dict[str, list[Decimal]] = defaultdict(list)
+    totals: dict[str, Decimal] = {}
+    unparsed_tags: set[str] = set()
     if isinstance(inputs, dict):
-        items_iter = (item for items in inputs.values() for item in items)
+        items_iter = chain.from_iterable(inputs.values())
     else:
         items_iter = iter(inputs)
     for item in items_iter:
-        for tag in item.get('Tags', []):
-            by_tag[tag].append(item)
-    return {'by_tag': by_tag}
+        tags = item.get('Tags')
+        if tags:
+            try:
+                amount = Decimal(item['Amount'])
+            except (InvalidOperation, KeyError, TypeError, ValueError):
+                amount = None
+            for tag in tags:
+                # Tag literals in this module are interned by the compiler;
+                # interning JSON tags lets tag_total's lookups match by identity.
+                # Non-string tags from hand-edited JSON are indexed as they are.
+                if isinstance(tag, str):
+                    tag = sys.intern(tag)
+                by_tag[tag].append(item)
+                if amount is None:
+                    unparsed_tags.add(tag)
+                else:
+                    totals[tag] = totals.get(tag, _ZERO) + amount
+                    amounts_by_tag[tag].append(amount)
+    # Tags with a non-numeric amount have no precomputed total or amounts;
+    # tag_total falls back to per-item parsing for them so the parse error
+    # surfaces only if the tag is actually used.
+    for tag in unparsed_tags:
+        totals.pop(tag, None)
+        amounts_by_tag.pop(tag, None)
+    # The index is read-only once built; a plain dict of tuples keeps lookups
+    # off the defaultdict code path and stops stray reads from inserting keys.
+    return {
+        'by_tag': {tag: tuple(items) for tag, items in by_tag.items()},
+        'totals': totals,
+        'amounts_by_tag': dict(amounts_by_tag),
+    }
+
+
+def _index_with_item(index: dict, old_item: dict | None, new_item: dict) -> dict:
+    """
+    Return a copy of an inputs index with one item replaced or appended.
+
+    With old_item set, it is swapped for new_item (matched by identity) under
+    each of new_item's tags; both must carry the same Tags. With old_item
+    None, new_item is appended as if it were the last input. Only the
+    affected tags are re-summed, reusing the amounts already parsed into
+    index, and the given index is not modified.
+    """
+    by_tag = dict(index['by_tag'])
+    totals = dict(index['totals'])
+    amounts_by_tag = dict(index['amounts_by_tag'])
+    tags = new_item.get('Tags')
+    if not tags:
+        return {'by_tag': by_tag, 'totals': totals, 'amounts_by_tag': amounts_by_tag}
+    try:
+        new_amount = Decimal(new_item['Amount'])
+    except (InvalidOperation, KeyError, TypeError, ValueError):
+        new_amount = None
+    for tag in set(tags):
+        if isinstance(tag, str):
+            tag = sys.intern(tag)
+        items = by_tag.get(tag, ())
+        amounts = amounts_by_tag.get(tag, [] if not items else None)
+        if old_item is None:
+            count = tags.count(tag)
+            items = items + (new_item,) * count
+            if amounts is not None and new_amount is not None:
+                amounts = amounts + [new_amount] * count
+        else:
+            positions = [k for k, item in enumerate(items) if item is old_item]
+            items = list(items)
+            if amounts is not None and new_amount is not None:
+                amounts = list(amounts)
+                for k in positions:
+                    amounts[k] = new_amount
+            for k in positions:
+                items[k] = new_item
+            items = tuple(items)
+        by_tag[tag] = items
+        if new_amount is None:
+            amounts = None
+        elif amounts is None:
+            # The tag was left unparsed at build time; the replaced item may
+            # have been the only bad amount, so try the full list again.
+            try:
+                amounts = [Decimal(item['Amount']) for item in items]
+            except (InvalidOperation, KeyError, TypeError, ValueError):
+                pass
+        if amounts is None:
+            totals.pop(tag, None)
+            amounts_by_tag.pop(tag, None)
+        else:
+            totals[tag] = sum(amounts, _ZERO)
+            amounts_by_tag[tag] = amounts
+    return {'by_tag': by_tag, 'totals': totals, 'amounts_by_tag': amounts_by_tag}
 
 
 def tag_total(
@@ -55,15 +170,42 @@ def tag_total(
     required: bool = False,
     round_each: bool = False,
 ) -> Decimal:
-    items = list(index['by_tag'].get(tag, []))
+    items = index['by_tag'].get(tag, ())
     if required and not items:
         raise ValueError(f"Expected at least 1 item for tag '{tag}', found 0")
-    if round_each:
-        return sum(
-            (round_to_dollars(Decimal(item['Amount'])) for item in items),
-            Decimal('0'),
-        )
-    return sum((Decimal(item['Amount']) for item in items), Decimal('0'))
+    if not items:
+        return _ZERO
+    if not round_each:
+        total = index['totals'].get(tag)
+        if total is not None:
+            return total
+    # Amounts are parsed at index build time; tags skipped there (missing or
+    # non-numeric amounts) are re-parsed here so the error surfaces on use.
+    amounts = index['amounts_by_tag'].get(tag)
+    if amounts is None:
+        amounts = [Decimal(item['Amount']) for item in items]
+    if not round_each:
+        return sum(amounts, _ZERO)
+    # Accumulate in a plain loop; sum() over a generator adds a frame
+    # resume per item on top of the round_to_dollars call.
+    total = _ZERO
+    round_amount = round_to_dollars
+    for amount in amounts:
+        total += round_amount(amount)
+    return total
+
+
+_ITEM_AMOUNT = itemgetter('amount')
+
+
+def _sum_item_amounts(items: list[dict]) -> Decimal:
+    """
+    Sum the 'amount' field of line-item dicts as Decimal.
+
+    The map/itemgetter chain keeps the per-item loop in C instead of a Python
+    accumulator loop.
+    """
+    return sum(map(Decimal, map(_ITEM_AMOUNT, items)), _ZERO)
 
 
 def set_compute_checks_mode(
@@ -101,6 +243,9 @@ def _expected_decimal_for_path(path: str) -> Decimal | None:
 
 
 def _check_compute_line(path: str, actual: Decimal) -> None:
+    # Checks are off outside tests; bail out before the path lookup call.
+    if not _COMPUTE_CHECKS_ENABLED:
+        return
     expected = _expected_decimal_for_path(path)
     if expected is None:
         return
@@ -109,6 +254,214 @@ def _check_compute_line(path: str, actual: Decimal) -> None:
         raise AssertionError(f"{prefix}{path}: expected {expected}, got {actual}")
 
 
+_POLICY_CACHE: dict[int, tuple[dict, dict]] = {}
+_POLICY_CACHE_SIZE = 8
+_POLICY_MEMO_SIZE = 4096
+
+
+def clear_policy_cache() -> None:
+    """
+    Drop all cached policy values and memoized policy lookups.
+
+    Call this after mutating a policy dict in place; otherwise the cached
+    Decimal values and lookup results for that dict go stale.
+    """
+    _POLICY_CACHE.clear()
+
+
+def _policy_cache(policy: dict) -> dict:
+    """
+    Return the scratch dict holding values derived from one policy dict.
+
+    Policy dicts are long-lived configuration objects, so derived values are
+    cached by object identity, not by value: edits made to a policy dict in
+    place are not seen until clear_policy_cache() is called. Each cache entry
+    keeps a strong reference to its policy dict, which prevents the id from
+    being reused while the entry exists. At most _POLICY_CACHE_SIZE policy
+    dicts are held; when another one arrives the whole cache is emptied.
+    """
+    cached = _POLICY_CACHE.get(id(policy))
+    if cached is not None and cached[0] is policy:
+        return cached[1]
+    if len(_POLICY_CACHE) >= _POLICY_CACHE_SIZE:
+        _POLICY_CACHE.clear()
+    store: dict = {}
+    _POLICY_CACHE[id(policy)] = (policy, store)
+    return store
+
+
+def _policy_memo(policy: dict, name: str) -> dict:
+    """
+    Return a bounded memo table for a pure policy-dependent lookup.
+
+    Used for rate-schedule lookups that are re-evaluated with the same income
+    many times (worksheet lines 22/24/25, marginal tables).
+    """
+    store = _policy_cache(policy)
+    memo = store.get(name)
+    if memo is None or len(memo) >= _POLICY_MEMO_SIZE:
+        memo = store[name] = {}
+    return memo
+
+
+class _CapitalGainsPolicy(NamedTuple):
+    zero_rate_threshold: Decimal
+    twenty_rate_threshold: Decimal
+    rate_15: Decimal
+    rate_20: Decimal
+
+
+class _RateScheduleRow(NamedTuple):
+    min: Decimal
+    max: Decimal | None
+    rate: Decimal
+    amount: Decimal
+
+
+class _RateSchedule(NamedTuple):
+    mins: list[Decimal]
+    rows: tuple[_RateScheduleRow, ...]
+    ordered: bool
+
+
+def _compiled_rate_schedule(
+    policy: dict,
+    name: str,
+    rows: list[dict],
+    amount_key: str,
+) -> _RateSchedule:
+    """
+    Return a policy rate schedule with its bounds and rates parsed to Decimal.
+
+    `amount_key` names the per-row dollar amount (e.g. 'subtract_amount' or
+    'base_tax'). The schedule is marked ordered when rows are sorted by min
+    and overlap at most on a shared boundary (e.g. max 21600 / next min 21600),
+    which lets lookups bisect instead of scanning.
+    """
+    store = _policy_cache(policy)
+    key = f'rate_schedule:{name}'
+    schedule = store.get(key)
+    if schedule is not None:
+        return schedule
+
+    parsed = tuple(
+        _RateScheduleRow(
+            min=Decimal(row['min']),
+            max=None if row['max'] is None else Decimal(row['max']),
+            rate=Decimal(row['rate']),
+            amount=Decimal(row[amount_key]),
+        )
+        for row in rows
+    )
+    ordered = all(
+        prev.max is not None and prev.min < row.min and prev.max <= row.min
+        for prev, row in zip(parsed, parsed[1:])
+    )
+    schedule = _RateSchedule([row.min for row in parsed], parsed, ordered)
+    store[key] = schedule
+    return schedule
+
+
+def _rate_schedule_row(schedule: _RateSchedule, income: Decimal) -> _RateScheduleRow | None:
+    """
+    Return the first schedule row whose [min, max] range contains income.
+
+    For ordered schedules this is a binary search on the row minimums; gaps
+    between rows (e.g. max 201050 / next min 201051) still match nothing, and
+    income on a shared boundary goes to the earlier row, as in a linear scan.
+    """
+    if schedule.ordered:
+        position = bisect_right(schedule.mins, income) - 1
+        if position > 0:
+            previous = schedule.rows[position - 1]
+            if previous.min <= income <= previous.max:
+                return previous
+        if position >= 0:
+            row = schedule.rows[position]
+            if row.max is None or income <= row.max:
+                return row
+        return None
+    for row in schedule.rows:
+        if income >= row.min and (row.max is None or income <= row.max):
+            return row
+    return None
+
+
+def _capital_gains_policy(policy: dict) -> _CapitalGainsPolicy:
+    """
+    Return policy['capital_gains'] thresholds and rates parsed to Decimal.
+    """
+    store = _policy_cache(policy)
+    capital_gains = store.get('capital_gains')
+    if capital_gains is not None:
+        return capital_gains
+
+    params = policy['capital_gains']
+    capital_gains = _CapitalGainsPolicy(
+        zero_rate_threshold=Decimal(params['zero_rate_threshold']),
+        twenty_rate_threshold=Decimal(params['twenty_rate_threshold']),
+        rate_15=Decimal(params['rate_15']),
+        rate_20=Decimal(params['rate_20']),
+    )
+    store['capital_gains'] = capital_gains
+    return capital_gains
+
+
+def _policy_decimal(policy: dict, *keys: str) -> Decimal:
+    """
+    Return the policy value at policy[keys[0]][keys[1]]... parsed to Decimal.
+
+    Each value is parsed on first use and cached per policy dict, so a line
+    function only requires the policy keys it actually reads.
+    """
+    store = _policy_cache(policy)
+    value = store.get(keys)
+    if value is None:
+        node = policy
+        for key in keys:
+            node = node[key]
+        value = store[keys] = Decimal(node)
+    return value
+
+
+class _It219IncomeFactorPolicy(NamedTuple):
+    lower_threshold: Decimal
+    upper_threshold: Decimal
+    lower_factor: Decimal
+    upper_factor: Decimal
+    slope: Decimal
+
+
+def _it219_income_factor_policy(policy: dict) -> _It219IncomeFactorPolicy:
+    """
+    Return policy['ny_it219_income_factor'] parsed to Decimal, with its slope.
+    """
+    store = _policy_cache(policy)
+    it219 = store.get('ny_it219_income_factor')
+    if it219 is not None:
+        return it219
+
+    params = policy['ny_it219_income_factor']
+    lower_threshold = Decimal(params['lower_threshold'])
+    upper_threshold = Decimal(params['upper_threshold'])
+    lower_factor = Decimal(params['lower_factor'])
+    upper_factor = Decimal(params['upper_factor'])
+    it219 = _It219IncomeFactorPolicy(
+        lower_threshold=lower_threshold,
+        upper_threshold=upper_threshold,
+        lower_factor=lower_factor,
+        upper_factor=upper_factor,
+        # Only used strictly between the thresholds, so equal thresholds need no slope.
+        slope=(
+            (upper_factor - lower_factor) / (upper_threshold - lower_threshold)
+            if upper_threshold != lower_threshold
+            else _ZERO
+        ),
+    )
+    store['ny_it219_income_factor'] = it219
+    return it219
+
+
 def federal_schedule_se_line_2_schedule_c_and_k1_profit(
     k1_box_14a_self_employment_earnings: Decimal,
     k1_box_12_section_179_deduction: Decimal,
@@ -168,7 +521,7 @@ def federal_schedule_se_line_6_total_se_earnings(
     Returns:
         Total self-employment earnings subject to SE tax
     """
-    earnings_factor = Decimal(policy['self_employment_tax']['earnings_factor'])
+    earnings_factor = _policy_decimal(policy, 'self_employment_tax', 'earnings_factor')
     if line_2_schedule_c_and_k1_profit > 0:
         earnings = line_2_schedule_c_and_k1_profit * earnings_factor
         return round_to_dollars(earnings)
@@ -200,8 +553,8 @@ def federal_schedule_se_line_10_social_security_tax(
     Returns:
         Social Security tax on self-employment income
     """
-    ss_wage_base = Decimal(policy['self_employment_tax']['social_security_wage_base'])
-    social_security_rate = Decimal(policy['self_employment_tax']['social_security_rate'])
+    ss_wage_base = _policy_decimal(policy, 'self_employment_tax', 'social_security_wage_base')
+    social_security_rate = _policy_decimal(policy, 'self_employment_tax', 'social_security_rate')
     taxable_amount = min(line_6_self_employment_earnings, ss_wage_base)
     tax = taxable_amount * social_security_rate
     return round_to_dollars(tax)
@@ -231,7 +584,7 @@ def federal_schedule_se_line_11_medicare_tax(
     Returns:
         Medicare tax on self-employment income
     """
-    medicare_rate = Decimal(policy['self_employment_tax']['medicare_rate'])
+    medicare_rate = _policy_decimal(policy, 'self_employment_tax', 'medicare_rate')
     tax = line_6_self_employment_earnings * medicare_rate
     return round_to_dollars(tax)
 
@@ -298,23 +651,32 @@ def federal_form_8959_line_18_additional_medicare_tax(
     Returns:
         Total Additional Medicare Tax
     """
-    amt_policy = policy['additional_medicare_tax']
-    rate = Decimal(amt_policy['rate'])
+    if w2_medicare_wages <= 0 and schedule_se_line_6_se_earnings <= 0:
+        return _ZERO
+
+    rate = _policy_decimal(policy, 'additional_medicare_tax', 'rate')
 
-    threshold = Decimal(amt_policy['threshold'])
+    threshold = _policy_decimal(policy, 'additional_medicare_tax', 'threshold')
 
     # Part I: Additional Medicare Tax on W-2 wages (lines 1-7)
-    w2_over_threshold = max(Decimal('0'), w2_medicare_wages - threshold)
+    # Clamp at zero inline instead of max(Decimal('0'), x) to skip the builtin call.
+    w2_over_threshold = w2_medicare_wages - threshold
+    if w2_over_threshold <= 0:
+        w2_over_threshold = _ZERO
     part1_tax = round_to_dollars(w2_over_threshold * rate)
 
     # Part II: Additional Medicare Tax on SE income (lines 8-13)
     # Remaining threshold after W-2 wages
-    remaining_threshold = max(Decimal('0'), threshold - w2_medicare_wages)
-    se_over_threshold = max(Decimal('0'), schedule_se_line_6_se_earnings - remaining_threshold)
+    remaining_threshold = threshold - w2_medicare_wages
+    if remaining_threshold <= 0:
+        remaining_threshold = _ZERO
+    se_over_threshold = schedule_se_line_6_se_earnings - remaining_threshold
+    if se_over_threshold <= 0:
+        se_over_threshold = _ZERO
     part2_tax = round_to_dollars(se_over_threshold * rate)
 
     # Part III: RRTA compensation (assumed 0)
-    part3_tax = Decimal('0')
+    part3_tax = _ZERO
 
     # Line 18: Total Additional Medicare Tax
     return part1_tax + part2_tax + part3_tax
@@ -413,9 +775,8 @@ def federal_form_8960_line_9b_state_local_foreign_income_tax(
         Capped state/local/foreign income tax amount (line 9b)
     """
     total = tag_total(index, 'form_8960_line_9b_state_local_foreign_income_tax')
-    cap_policy = policy['state_local_tax_deduction']
-    cap = Decimal(cap_policy['cap'])
-    return round_to_dollars(min(total, cap))
+    cap = _policy_decimal(policy, 'state_local_tax_deduction', 'cap')
+    return round_to_dollars(cap if cap < total else total)
 
 
 def federal_form_8960_line_9d_total_investment_expenses(
@@ -740,7 +1101,7 @@ def federal_schedule_1_line_15_deductible_self_employment_tax(
     Returns:
         Schedule 1 line 15 amount
     """
-    return round_to_dollars(schedule_se_line_12_self_employment_tax / Decimal('2'))
+    return round_to_dollars(schedule_se_line_12_self_employment_tax * _HALF)
 
 
 def federal_schedule_1_line_16_self_employed_retirement_contributions(
@@ -867,7 +1228,7 @@ def federal_form_6781_line_8_short_term_portion(
     Returns:
         Short-term portion (line 8)
     """
-    short_term_rate = Decimal(policy['section_1256']['short_term_rate'])
+    short_term_rate = _policy_decimal(policy, 'section_1256', 'short_term_rate')
     return round_to_dollars(line_7_total_gain_loss * short_term_rate)
 
 
@@ -891,7 +1252,7 @@ def federal_form_6781_line_9_long_term_portion(
     Returns:
         Long-term portion (line 9)
     """
-    long_term_rate = Decimal(policy['section_1256']['long_term_rate'])
+    long_term_rate = _policy_decimal(policy, 'section_1256', 'long_term_rate')
     return round_to_dollars(line_7_total_gain_loss * long_term_rate)
 
 
@@ -992,7 +1353,7 @@ def federal_schedule_d_line_7_net_short_term_gain(
     line_3_short_term_adjustment: Decimal,
     line_4_short_term_from_6781: Decimal,
     line_5_short_term_k1_gain: Decimal,
-    line_6_short_term_loss_carryover: Decimal = Decimal('0'),
+    line_6_short_term_loss_carryover: Decimal | None = None,
 ) -> Decimal:
     """
     Calculate Schedule D line 7 net short-term gain/loss.
@@ -1020,13 +1381,15 @@ def federal_schedule_d_line_7_net_short_term_gain(
     Returns:
         Net short-term capital gain/loss (line 7)
     """
-    return (
+    total = (
         line_1a_short_term_gain +
         line_3_short_term_adjustment +
         line_4_short_term_from_6781 +
-        line_5_short_term_k1_gain +
-        line_6_short_term_loss_carryover
+        line_5_short_term_k1_gain
     )
+    if line_6_short_term_loss_carryover is not None:
+        total += line_6_short_term_loss_carryover
+    return total
 
 
 def federal_schedule_d_line_10_long_term_section_1061_adjustment(
@@ -1218,9 +1581,9 @@ def federal_form_8960_line_4a_rental_real_estate_royalties_partnerships(
 
 def federal_form_8960_line_4b_adjustment_nonsection_1411(
     nonpassive_income: Decimal,
-    nonpassive_losses_allowed: Decimal = Decimal('0'),
-    section_179_deduction: Decimal = Decimal('0'),
-    additional_nonpassive_deductions: Decimal = Decimal('0'),
+    nonpassive_losses_allowed: Decimal | None = None,
+    section_179_deduction: Decimal | None = None,
+    additional_nonpassive_deductions: Decimal | None = None,
 ) -> Decimal:
     """
     Calculate Form 8960 line 4b adjustment for non-section 1411 trade/business.
@@ -1246,12 +1609,15 @@ def federal_form_8960_line_4b_adjustment_nonsection_1411(
     Returns:
         Form 8960 line 4b total adjustment (negative for net income)
     """
-    total_deductions = (
-        nonpassive_losses_allowed
-        + section_179_deduction
-        + additional_nonpassive_deductions
-    )
-    net_nonpassive = nonpassive_income - total_deductions
+    # Omitted deductions are skipped rather than added as zero.
+    net_nonpassive = nonpassive_income
+    for deduction in (
+        nonpassive_losses_allowed,
+        section_179_deduction,
+        additional_nonpassive_deductions,
+    ):
+        if deduction is not None:
+            net_nonpassive -= deduction
     return -round_to_dollars(net_nonpassive)
 
 
@@ -1302,8 +1668,8 @@ def federal_form_8960_line_5a_net_gain_loss_disposition(
 
 def federal_form_8960_line_5d_net_gain_loss_disposition(
     line_5a_net_gain_loss_disposition: Decimal,
-    line_5b_gain_not_subject_to_niit: Decimal = Decimal('0'),
-    line_5c_adjustment_disposition_partnership_interest: Decimal = Decimal('0'),
+    line_5b_gain_not_subject_to_niit: Decimal | None = None,
+    line_5c_adjustment_disposition_partnership_interest: Decimal | None = None,
 ) -> Decimal:
     """
     Calculate net gain/loss from disposition of property (Form 8960, line 5d).
@@ -1328,11 +1694,12 @@ def federal_form_8960_line_5d_net_gain_loss_disposition(
     Returns:
         Net gain/loss from disposition of property (line 5d)
     """
-    return (
-        line_5a_net_gain_loss_disposition +
-        line_5b_gain_not_subject_to_niit +
-        line_5c_adjustment_disposition_partnership_interest
-    )
+    total = line_5a_net_gain_loss_disposition
+    if line_5b_gain_not_subject_to_niit is not None:
+        total += line_5b_gain_not_subject_to_niit
+    if line_5c_adjustment_disposition_partnership_interest is not None:
+        total += line_5c_adjustment_disposition_partnership_interest
+    return total
 
 
 def federal_form_1040_line_1z_wages(
@@ -1471,13 +1838,12 @@ def federal_form_1040_line_12_standard_deduction(
     """
     if line_12_deduction_override is not None:
         return round_to_dollars(line_12_deduction_override)
-    standard_deduction = Decimal(policy['standard_deduction'])
-    return standard_deduction
+    return _policy_decimal(policy, 'standard_deduction')
 
 
 def federal_form_1040_line_14_total_deductions(
     line_12_standard_deduction: Decimal,
-    line_13_qbi_deduction: Decimal = Decimal('0'),
+    line_13_qbi_deduction: Decimal | None = None,
 ) -> Decimal:
     """
     Calculate Form 1040 line 14 total deductions.
@@ -1499,6 +1865,8 @@ def federal_form_1040_line_14_total_deductions(
     Returns:
         Total deductions (line 14)
     """
+    if line_13_qbi_deduction is None:
+        return line_12_standard_deduction
     return line_12_standard_deduction + line_13_qbi_deduction
 
 
@@ -1532,11 +1900,11 @@ def _qualified_dividends_capital_gain_worksheet_lines_3_to_5(
     schedule_d_line_15: Decimal,
     schedule_d_line_16: Decimal,
 ) -> tuple[Decimal, Decimal, Decimal]:
-    line_3 = Decimal('0')
+    line_3 = _ZERO
     if schedule_d_line_15 > 0 and schedule_d_line_16 > 0:
         line_3 = min(schedule_d_line_15, schedule_d_line_16)
     line_4 = line_2_qualified_dividends + line_3
-    line_5 = max(line_1_taxable_income - line_4, Decimal('0'))
+    line_5 = max(line_1_taxable_income - line_4, _ZERO)
     return line_3, line_4, line_5
 
 
@@ -1561,25 +1929,27 @@ def federal_form_1040_tax_computation_worksheet_tax(
     Returns:
         Tax computed per worksheet
     """
+    memo = _policy_memo(policy, 'tax_computation_worksheet_tax')
+    memoized = memo.get(taxable_income)
+    if memoized is not None:
+        return memoized
+
     worksheet = policy['tax_computation_worksheet']
-    min_income = Decimal(worksheet['min_income'])
+    min_income = _policy_decimal(policy, 'tax_computation_worksheet', 'min_income')
     if taxable_income < min_income:
         raise ValueError(
             "Tax computation worksheet applies to amounts at or above "
             f"{min_income}. Got {taxable_income}."
         )
 
-    sections = worksheet['sections']
-    for row in sections:
-        row_min = Decimal(row['min'])
-        row_max = row['max']
-        if row_max is not None:
-            row_max = Decimal(row_max)
-        if taxable_income >= row_min and (row_max is None or taxable_income <= row_max):
-            rate = Decimal(row['rate'])
-            subtract_amount = Decimal(row['subtract_amount'])
-            tax = taxable_income * rate - subtract_amount
-            return round_to_dollars(tax)
+    sections = _compiled_rate_schedule(
+        policy, 'tax_computation_worksheet', worksheet['sections'], 'subtract_amount'
+    )
+    row = _rate_schedule_row(sections, taxable_income)
+    if row is not None:
+        tax = round_to_dollars(taxable_income * row.rate - row.amount)
+        memo[taxable_income] = tax
+        return tax
 
     raise ValueError(f"No tax computation worksheet row matched income {taxable_income}.")
 
@@ -1620,10 +1990,7 @@ def federal_form_1040_qualified_dividends_capital_gain_worksheet_line_22_tax_on_
         schedule_d_line_15,
         schedule_d_line_16,
     )
-    return federal_form_1040_tax_computation_worksheet_tax(
-        taxable_income=line_5,
-        policy=policy,
-    )
+    return federal_form_1040_tax_computation_worksheet_tax(line_5, policy)
 
 
 def federal_form_1040_qualified_dividends_capital_gain_worksheet_line_24_tax_on_line_1(
@@ -1685,25 +2052,32 @@ def federal_form_1040_qualified_dividends_capital_gain_worksheet_line_25(
     Returns:
         Worksheet line 25 amount (tax on all taxable income)
     """
+    # With no qualified dividends or net gains, lines 3-4 are zero and line 5
+    # equals line 1, so line 23 collapses to line 24.
+    if (
+        line_2_qualified_dividends == 0
+        and schedule_d_line_15 <= 0
+        and schedule_d_line_16 <= 0
+    ):
+        return federal_form_1040_qualified_dividends_capital_gain_worksheet_line_24_tax_on_line_1(
+            line_1_taxable_income,
+            policy,
+        )
+
     line_3, line_4, line_5 = _qualified_dividends_capital_gain_worksheet_lines_3_to_5(
         line_1_taxable_income,
         line_2_qualified_dividends,
         schedule_d_line_15,
         schedule_d_line_16,
     )
-    line_22_tax_on_line_5 = federal_form_1040_qualified_dividends_capital_gain_worksheet_line_22_tax_on_line_5(
-        line_1_taxable_income,
-        line_2_qualified_dividends,
-        schedule_d_line_15,
-        schedule_d_line_16,
-        policy,
-    )
+    line_22_tax_on_line_5 = federal_form_1040_tax_computation_worksheet_tax(line_5, policy)
     line_24_tax_on_line_1 = federal_form_1040_qualified_dividends_capital_gain_worksheet_line_24_tax_on_line_1(
         line_1_taxable_income,
         policy,
     )
 
-    zero_rate_threshold = Decimal(policy['capital_gains']['zero_rate_threshold'])
+    capital_gains = _capital_gains_policy(policy)
+    zero_rate_threshold = capital_gains.zero_rate_threshold
     line_7 = min(line_1_taxable_income, zero_rate_threshold)
     line_8 = min(line_5, line_7)
     line_9 = line_7 - line_8
@@ -1711,19 +2085,20 @@ def federal_form_1040_qualified_dividends_capital_gain_worksheet_line_25(
     line_10 = min(line_1_taxable_income, line_4)
     line_12 = line_10 - line_9
 
-    twenty_rate_threshold = Decimal(policy['capital_gains']['twenty_rate_threshold'])
+    twenty_rate_threshold = capital_gains.twenty_rate_threshold
     line_14 = min(line_1_taxable_income, twenty_rate_threshold)
     line_15 = line_5 + line_9
-    line_16 = max(line_14 - line_15, Decimal('0'))
+    line_16 = max(line_14 - line_15, _ZERO)
     line_17 = min(line_12, line_16)
 
-    rate_15 = Decimal(policy['capital_gains']['rate_15'])
-    rate_20 = Decimal(policy['capital_gains']['rate_20'])
+    rate_15 = capital_gains.rate_15
+    rate_20 = capital_gains.rate_20
     line_18 = round_to_dollars(line_17 * rate_15)
     line_19 = line_9 + line_17
     line_20 = line_10 - line_19
     line_21 = round_to_dollars(line_20 * rate_20)
-    line_23 = round_to_dollars(line_18 + line_21 + line_22_tax_on_line_5)
+    # Lines 18, 21 and 22 are already whole dollars, so their sum needs no rounding.
+    line_23 = line_18 + line_21 + line_22_tax_on_line_5
 
     return min(line_23, line_24_tax_on_line_1)
 
@@ -1823,18 +2198,20 @@ def ny_it201_statement_2_line_3_tax_from_rate_schedule(
     Returns:
         Statement 2 line 3 tax from rate schedule
     """
-    taxable_income = max(line_38_ny_taxable_income, Decimal('0'))
-    schedule = policy.get('ny_nys_tax_rate_schedule', [])
-    for row in schedule:
-        row_min = Decimal(row['min'])
-        row_max = row['max']
-        if row_max is not None:
-            row_max = Decimal(row_max)
-        if taxable_income >= row_min and (row_max is None or taxable_income <= row_max):
-            base_tax = Decimal(row['base_tax'])
-            rate = Decimal(row['rate'])
-            tax = base_tax + (taxable_income - row_min) * rate
-            return round_to_dollars(tax)
+    taxable_income = max(line_38_ny_taxable_income, _ZERO)
+    memo = _policy_memo(policy, 'ny_nys_tax_rate_schedule')
+    memoized = memo.get(taxable_income)
+    if memoized is not None:
+        return memoized
+
+    schedule = _compiled_rate_schedule(
+        policy, 'ny_nys_tax_rate_schedule', policy.get('ny_nys_tax_rate_schedule', []), 'base_tax'
+    )
+    row = _rate_schedule_row(schedule, taxable_income)
+    if row is not None:
+        tax = round_to_dollars(row.amount + (taxable_income - row.min) * row.rate)
+        memo[taxable_income] = tax
+        return tax
 
     raise ValueError(f"No NYS tax schedule row matched income {taxable_income}.")
 
@@ -1857,8 +2234,7 @@ def ny_it201_statement_2_line_4_recapture_base_amount(
     Returns:
         Statement 2 line 4 recapture base amount
     """
-    worksheet = policy.get('ny_tax_computation_worksheet_4', {})
-    return Decimal(worksheet['recapture_base_amount'])
+    return _policy_decimal(policy, 'ny_tax_computation_worksheet_4', 'recapture_base_amount')
 
 
 def ny_it201_statement_2_line_9_incremental_benefit_addback(
@@ -1879,8 +2255,9 @@ def ny_it201_statement_2_line_9_incremental_benefit_addback(
     Returns:
         Statement 2 line 9 incremental benefit addback
     """
-    worksheet = policy.get('ny_tax_computation_worksheet_4', {})
-    return Decimal(worksheet['incremental_benefit_addback'])
+    return _policy_decimal(
+        policy, 'ny_tax_computation_worksheet_4', 'incremental_benefit_addback'
+    )
 
 
 def ny_it112r_line_22_total_income(
@@ -1919,10 +2296,7 @@ def ny_it112r_line_22_other_state_income(
     Returns:
         Line 22 other-state income (column B)
     """
-    total = Decimal("0")
-    for item in line_22_other_state_income_items:
-        total += Decimal(item["amount"])
-    return total
+    return _sum_item_amounts(line_22_other_state_income_items)
 
 
 def ny_it112r_line_24_total_other_state_tax(
@@ -1940,10 +2314,7 @@ def ny_it112r_line_24_total_other_state_tax(
     Returns:
         Line 24 total other-state tax
     """
-    total = Decimal("0")
-    for item in line_24_total_other_state_tax_items:
-        total += Decimal(item["amount"])
-    return total
+    return _sum_item_amounts(line_24_total_other_state_tax_items)
 
 
 def ny_it112r_line_26_ratio(
@@ -1968,9 +2339,9 @@ def ny_it112r_line_26_ratio(
         Line 26 ratio rounded to 4 decimals
     """
     if line_22_total_income == 0:
-        return Decimal('0')
+        return _ZERO
     ratio = line_22_other_state_income / line_22_total_income
-    return ratio.quantize(Decimal('0.0001'), rounding=ROUND_HALF_UP)
+    return ratio.quantize(_FOUR_PLACES, ROUND_HALF_UP)
 
 
 def ny_it112r_line_27_ny_tax_times_ratio(
@@ -2018,7 +2389,9 @@ def ny_it112r_line_28_smaller_of_line24_or_27(
     Returns:
         Line 28 amount
     """
-    return min(line_24_total_other_state_tax, line_27_ny_tax_times_ratio)
+    if line_24_total_other_state_tax <= line_27_ny_tax_times_ratio:
+        return line_24_total_other_state_tax
+    return line_27_ny_tax_times_ratio
 
 
 def ny_it112r_line_30_total_credit(
@@ -2070,7 +2443,9 @@ def ny_it112r_line_34_resident_credit(
     Returns:
         Line 34 resident credit
     """
-    return min(line_30_total_credit, line_25_ny_tax_payable)
+    if line_30_total_credit <= line_25_ny_tax_payable:
+        return line_30_total_credit
+    return line_25_ny_tax_payable
 
 
 def ny_it201_line_38_ny_taxable_income(
@@ -2169,13 +2544,10 @@ def ny_it201_line_28_us_gov_bond_interest(
     Returns:
         Line 28 U.S. government bond interest subtraction
     """
-    percentages = policy["ny_us_gov_bond_interest_percentages"]
-    total = Decimal("0")
+    total = _ZERO
     for item in line_28_us_gov_bond_interest_items:
-        fund = item["fund"]
-        amount = Decimal(item["amount"])
-        percentage = Decimal(percentages[fund])
-        total += amount * percentage
+        percentage = _policy_decimal(policy, 'ny_us_gov_bond_interest_percentages', item["fund"])
+        total += Decimal(item["amount"]) * percentage
     return round_to_dollars(total)
 
 
@@ -2229,9 +2601,9 @@ def ny_it201_line_19_federal_agi(
 
 def ny_it201_line_24_ny_total_income(
     line_19_federal_agi: Decimal,
-    line_21_public_employee_414h: Decimal = Decimal('0'),
-    line_22_ny_529_distributions: Decimal = Decimal('0'),
-    line_23_other_additions: Decimal = Decimal('0'),
+    line_21_public_employee_414h: Decimal | None = None,
+    line_22_ny_529_distributions: Decimal | None = None,
+    line_23_other_additions: Decimal | None = None,
 ) -> Decimal:
     """
     Calculate NY IT-201 line 24 (New York total income).
@@ -2258,12 +2630,15 @@ def ny_it201_line_24_ny_total_income(
     Returns:
         Line 24 NY total income
     """
-    return (
-        line_19_federal_agi
-        + line_21_public_employee_414h
-        + line_22_ny_529_distributions
-        + line_23_other_additions
-    )
+    total = line_19_federal_agi
+    for addition in (
+        line_21_public_employee_414h,
+        line_22_ny_529_distributions,
+        line_23_other_additions,
+    ):
+        if addition is not None:
+            total += addition
+    return total
 
 
 def ny_it201_line_23_other_additions(
@@ -2302,10 +2677,7 @@ def ny_it225_line_1a_additions(
     Returns:
         Line 1a additions total
     """
-    total = Decimal("0")
-    for item in line_1a_additions_items:
-        total += Decimal(item["amount"])
-    return total
+    return _sum_item_amounts(line_1a_additions_items)
 
 
 def ny_it225_line_5a_additions(
@@ -2323,10 +2695,7 @@ def ny_it225_line_5a_additions(
     Returns:
         Line 5a additions total
     """
-    total = Decimal("0")
-    for item in line_5a_additions_items:
-        total += Decimal(item["amount"])
-    return total
+    return _sum_item_amounts(line_5a_additions_items)
 
 
 def ny_it225_line_5b_additions(
@@ -2344,10 +2713,7 @@ def ny_it225_line_5b_additions(
     Returns:
         Line 5b additions total
     """
-    total = Decimal("0")
-    for item in line_5b_additions_items:
-        total += Decimal(item["amount"])
-    return total
+    return _sum_item_amounts(line_5b_additions_items)
 
 
 def ny_it225_line_9_total_additions(
@@ -2535,7 +2901,7 @@ def ny_it201_line_36_dependent_exemptions(
     Returns:
         Line 36 dependent exemptions
     """
-    exemption_amount = Decimal(policy['ny_dependent_exemption_amount'])
+    exemption_amount = _policy_decimal(policy, 'ny_dependent_exemption_amount')
     return dependents_count * exemption_amount
 
 
@@ -2560,7 +2926,7 @@ def ny_it201_line_34_standard_deduction(
     Returns:
         Line 34 standard deduction
     """
-    return Decimal(policy['ny_standard_deduction'])
+    return _policy_decimal(policy, 'ny_standard_deduction')
 
 
 def ny_it201_line_43_nys_credits_total(
@@ -2721,10 +3087,7 @@ def ny_it219_line_7_beneficiary_ubt_credit(
     Returns:
         Line 7 beneficiary UBT credit total
     """
-    total = Decimal("0")
-    for item in line_7_beneficiary_ubt_credit_items:
-        total += Decimal(item["amount"])
-    return total
+    return _sum_item_amounts(line_7_beneficiary_ubt_credit_items)
 
 
 def ny_it219_line_9_taxable_income(
@@ -2765,18 +3128,15 @@ def ny_it219_line_10_income_factor(
     Returns:
         Line 10 income factor
     """
-    params = policy['ny_it219_income_factor']
-    lower_threshold = Decimal(params['lower_threshold'])
-    upper_threshold = Decimal(params['upper_threshold'])
-    lower_factor = Decimal(params['lower_factor'])
-    upper_factor = Decimal(params['upper_factor'])
+    params = _it219_income_factor_policy(policy)
+    lower_threshold = params.lower_threshold
+    lower_factor = params.lower_factor
     if line_9_taxable_income <= lower_threshold:
         return lower_factor
-    if line_9_taxable_income >= upper_threshold:
-        return upper_factor
-    slope = (upper_factor - lower_factor) / (upper_threshold - lower_threshold)
-    factor = lower_factor + (line_9_taxable_income - lower_threshold) * slope
-    return factor.quantize(Decimal('0.0001'), rounding=ROUND_HALF_UP)
+    if line_9_taxable_income >= params.upper_threshold:
+        return params.upper_factor
+    factor = lower_factor + (line_9_taxable_income - lower_threshold) * params.slope
+    return factor.quantize(_FOUR_PLACES, ROUND_HALF_UP)
 
 
 def ny_it219_line_8_total_ubt_credit(
@@ -2855,7 +3215,9 @@ def ny_it219_line_16_resident_ubt_credit(
     Returns:
         Line 16 resident UBT credit
     """
-    return min(line_11_income_based_credit, line_15_total_tax)
+    if line_11_income_based_credit <= line_15_total_tax:
+        return line_11_income_based_credit
+    return line_15_total_tax
 
 
 def ny_it201_att_line_8_nyc_resident_ubt_credit(
@@ -2916,10 +3278,7 @@ def ny_it201_att_line_12_other_refundable_credits(
     Returns:
         Line 12 total other refundable credits
     """
-    total = Decimal("0")
-    for item in line_12_other_refundable_credits_items:
-        total += Decimal(item["amount"])
-    return total
+    return _sum_item_amounts(line_12_other_refundable_credits_items)
 
 
 def ny_it201_att_line_13_total_refundable_credits(
@@ -3060,18 +3419,16 @@ def ny_it201_line_47a_nyc_resident_tax(
     Returns:
         Line 47a NYC resident tax
     """
-    taxable_income = max(line_47_nyc_taxable_income, Decimal('0'))
-    schedule = policy.get('nyc_resident_tax_rate_schedule', [])
-    for row in schedule:
-        row_min = Decimal(row['min'])
-        row_max = row['max']
-        if row_max is not None:
-            row_max = Decimal(row_max)
-        if taxable_income >= row_min and (row_max is None or taxable_income <= row_max):
-            base_tax = Decimal(row['base_tax'])
-            rate = Decimal(row['rate'])
-            tax = base_tax + (taxable_income - row_min) * rate
-            return round_to_dollars(tax)
+    taxable_income = max(line_47_nyc_taxable_income, _ZERO)
+    schedule = _compiled_rate_schedule(
+        policy,
+        'nyc_resident_tax_rate_schedule',
+        policy.get('nyc_resident_tax_rate_schedule', []),
+        'base_tax',
+    )
+    row = _rate_schedule_row(schedule, taxable_income)
+    if row is not None:
+        return round_to_dollars(row.amount + (taxable_income - row.min) * row.rate)
 
     raise ValueError(f"No NYC tax schedule row matched income {taxable_income}.")
 
@@ -3121,7 +3478,7 @@ def ny_it201_line_54c_mctmt_zone_1(
     Returns:
         Line 54c MCTMT for Zone 1
     """
-    rate = Decimal(policy['ny_mctmt_rates']['zone_1'])
+    rate = _policy_decimal(policy, 'ny_mctmt_rates', 'zone_1')
     return round_to_dollars(line_54a_mctmt_net_earnings_zone_1 * rate)
 
 
@@ -3148,13 +3505,14 @@ def ny_it2105_9_worksheet_4a_line_1_net_earnings_zone_1(
     Returns:
         Worksheet 4a line 1 net earnings for Zone 1
     """
-    earnings_factor = Decimal(policy["ny_mctmt"]["earnings_factor"])
-    total = Decimal("0")
+    earnings_factor = _policy_decimal(policy, 'ny_mctmt', 'earnings_factor')
+    # The factor is common to every item, so multiply the summed base once;
+    # Decimal products at these magnitudes are exact, so the result is unchanged.
+    net_earnings = _ZERO
     for item in worksheet_4a_line_1_net_earnings_zone_1_items:
-        ordinary_income = Decimal(item["ordinary_business_income"])
-        guaranteed_payments = Decimal(item["guaranteed_payments_services"])
-        total += (ordinary_income + guaranteed_payments) * earnings_factor
-    return round_to_dollars(total)
+        net_earnings += Decimal(item["ordinary_business_income"])
+        net_earnings += Decimal(item["guaranteed_payments_services"])
+    return round_to_dollars(net_earnings * earnings_factor)
 
 
 def ny_it201_line_54a_mctmt_net_earnings_zone_1(
@@ -3305,8 +3663,8 @@ def federal_form_1040_line_18_tax_and_amounts(
 
 
 def federal_form_1040_line_21_total_credits(
-    line_19_child_tax_credit: Decimal = Decimal('0'),
-    line_20_schedule_3_line_8: Decimal = Decimal('0'),
+    line_19_child_tax_credit: Decimal | None = None,
+    line_20_schedule_3_line_8: Decimal | None = None,
 ) -> Decimal:
     """
     Calculate Form 1040 line 21 total credits.
@@ -3325,7 +3683,11 @@ def federal_form_1040_line_21_total_credits(
     Returns:
         Total credits (line 21)
     """
-    return line_19_child_tax_credit + line_20_schedule_3_line_8
+    total = _ZERO
+    for credit in (line_19_child_tax_credit, line_20_schedule_3_line_8):
+        if credit is not None:
+            total += credit
+    return total
 
 
 def federal_form_1040_line_22_tax_after_credits(
@@ -3358,11 +3720,11 @@ def federal_form_1040_line_22_tax_after_credits(
 def federal_form_8960_line_8_total_investment_income(
     line_1_taxable_interest: Decimal,
     line_2_ordinary_dividends: Decimal,
-    line_3_annuities: Decimal = Decimal('0'),
-    line_4c_net_income_from_rentals: Decimal = Decimal('0'),
-    line_5d_net_gain_loss_disposition: Decimal = Decimal('0'),
-    line_6_adjustments_cfc_pfic: Decimal = Decimal('0'),
-    line_7_other_modifications: Decimal = Decimal('0'),
+    line_3_annuities: Decimal | None = None,
+    line_4c_net_income_from_rentals: Decimal | None = None,
+    line_5d_net_gain_loss_disposition: Decimal | None = None,
+    line_6_adjustments_cfc_pfic: Decimal | None = None,
+    line_7_other_modifications: Decimal | None = None,
 ) -> Decimal:
     """
     Calculate total investment income (Form 8960, line 8).
@@ -3393,15 +3755,17 @@ def federal_form_8960_line_8_total_investment_income(
     Returns:
         Total investment income (line 8)
     """
-    return (
-        line_1_taxable_interest +
-        line_2_ordinary_dividends +
-        line_3_annuities +
-        line_4c_net_income_from_rentals +
-        line_5d_net_gain_loss_disposition +
-        line_6_adjustments_cfc_pfic +
-        line_7_other_modifications
-    )
+    total = line_1_taxable_interest + line_2_ordinary_dividends
+    for line in (
+        line_3_annuities,
+        line_4c_net_income_from_rentals,
+        line_5d_net_gain_loss_disposition,
+        line_6_adjustments_cfc_pfic,
+        line_7_other_modifications,
+    ):
+        if line is not None:
+            total += line
+    return total
 
 
 def federal_form_8960_line_13_modified_adjusted_gross_income(
@@ -3446,9 +3810,9 @@ def federal_form_8960_line_15_modified_agi_over_threshold(
     Returns:
         Modified AGI over threshold (line 15)
     """
-    niit_policy = policy['net_investment_income_tax']
-    threshold = Decimal(niit_policy['threshold'])
-    return max(Decimal('0'), line_13_modified_adjusted_gross_income - threshold)
+    threshold = _policy_decimal(policy, 'net_investment_income_tax', 'threshold')
+    over_threshold = line_13_modified_adjusted_gross_income - threshold
+    return over_threshold if over_threshold > 0 else _ZERO
 
 
 def federal_form_8960_line_16_smaller_of_line_12_or_15(
@@ -3472,7 +3836,9 @@ def federal_form_8960_line_16_smaller_of_line_12_or_15(
     Returns:
         Line 16 amount
     """
-    return min(line_12_net_investment_income, line_15_modified_agi_over_threshold)
+    if line_12_net_investment_income <= line_15_modified_agi_over_threshold:
+        return line_12_net_investment_income
+    return line_15_modified_agi_over_threshold
 
 
 def federal_form_8960_line_17_net_investment_income_tax(
@@ -3496,7 +3862,7 @@ def federal_form_8960_line_17_net_investment_income_tax(
     Returns:
         Net investment income tax
     """
-    rate = Decimal(policy['net_investment_income_tax']['rate'])
+    rate = _policy_decimal(policy, 'net_investment_income_tax', 'rate')
     tax = line_16_smaller_of_line_12_or_15 * rate
     return round_to_dollars(tax)
 
@@ -3523,19 +3889,19 @@ def federal_schedule_2_line_12_net_investment_income_tax(
 
 
 def federal_schedule_2_line_21_other_taxes(
-    line_4_self_employment_tax: Decimal = Decimal('0'),
-    line_7_additional_ss_medicare_tax: Decimal = Decimal('0'),
-    line_8_ira_tax: Decimal = Decimal('0'),
-    line_9_household_employment_tax: Decimal = Decimal('0'),
-    line_10_homebuyer_credit_repayment: Decimal = Decimal('0'),
-    line_11_additional_medicare_tax: Decimal = Decimal('0'),
-    line_12_net_investment_income_tax: Decimal = Decimal('0'),
-    line_13_uncollected_ss_medicare_rrta: Decimal = Decimal('0'),
-    line_14_installment_interest: Decimal = Decimal('0'),
-    line_15_deferred_gain_interest: Decimal = Decimal('0'),
-    line_16_low_income_housing_recapture: Decimal = Decimal('0'),
-    line_18_recapture_net_epe: Decimal = Decimal('0'),
-    line_19_section_965_installment: Decimal = Decimal('0'),
+    line_4_self_employment_tax: Decimal | None = None,
+    line_7_additional_ss_medicare_tax: Decimal | None = None,
+    line_8_ira_tax: Decimal | None = None,
+    line_9_household_employment_tax: Decimal | None = None,
+    line_10_homebuyer_credit_repayment: Decimal | None = None,
+    line_11_additional_medicare_tax: Decimal | None = None,
+    line_12_net_investment_income_tax: Decimal | None = None,
+    line_13_uncollected_ss_medicare_rrta: Decimal | None = None,
+    line_14_installment_interest: Decimal | None = None,
+    line_15_deferred_gain_interest: Decimal | None = None,
+    line_16_low_income_housing_recapture: Decimal | None = None,
+    line_18_recapture_net_epe: Decimal | None = None,
+    line_19_section_965_installment: Decimal | None = None,
 ) -> Decimal:
     """
     Calculate total other taxes (Schedule 2, line 21).
@@ -3564,21 +3930,27 @@ def federal_schedule_2_line_21_other_taxes(
     Returns:
         Total other taxes amount
     """
-    return (
-        line_4_self_employment_tax +
-        line_7_additional_ss_medicare_tax +
-        line_8_ira_tax +
-        line_9_household_employment_tax +
-        line_10_homebuyer_credit_repayment +
-        line_11_additional_medicare_tax +
-        line_12_net_investment_income_tax +
-        line_13_uncollected_ss_medicare_rrta +
-        line_14_installment_interest +
-        line_15_deferred_gain_interest +
-        line_16_low_income_housing_recapture +
-        line_18_recapture_net_epe +
-        line_19_section_965_installment
-    )
+    # Most of these lines are omitted on a typical return; skip them instead
+    # of adding zeros.
+    total = _ZERO
+    for line in (
+        line_4_self_employment_tax,
+        line_7_additional_ss_medicare_tax,
+        line_8_ira_tax,
+        line_9_household_employment_tax,
+        line_10_homebuyer_credit_repayment,
+        line_11_additional_medicare_tax,
+        line_12_net_investment_income_tax,
+        line_13_uncollected_ss_medicare_rrta,
+        line_14_installment_interest,
+        line_15_deferred_gain_interest,
+        line_16_low_income_housing_recapture,
+        line_18_recapture_net_epe,
+        line_19_section_965_installment,
+    ):
+        if line is not None:
+            total += line
+    return total
 
 
 def federal_1040_line_23_other_taxes(
@@ -3636,6 +4008,9 @@ def compute_federal_total_tax(inputs: dict, policy: dict) -> Decimal:
 
     Form/Line: Form 1040, line 24 (final result)
 
+    Policy values are parsed once per policy dict and cached by identity;
+    call clear_policy_cache() after mutating a policy dict in place.
+
     Args:
         inputs: Input data dict containing all factual values
         policy: Policy configuration dict containing tax law parameters
@@ -3644,8 +4019,16 @@ def compute_federal_total_tax(inputs: dict, policy: dict) -> Decimal:
         Total federal tax amount
     """
     # Build lookup index for flat inputs list
-    index = build_inputs_index(inputs)
+    return _federal_total_tax_from_index(build_inputs_index(inputs), policy)
+
 
+def _federal_total_tax_from_index(index: dict, policy: dict) -> Decimal:
+    """
+    Compute the federal total tax from an inputs index built by build_inputs_index.
+
+    Lets callers that evaluate several totals over the same inputs (NY,
+    marginal tables) build the index once.
+    """
     # K-1 inputs (partnership source)
     k1_box_14a = tag_total(index, 'schedule_se_k1_box_14a_self_employment_earnings', required=True)
     k1_box_12 = tag_total(index, 'section_179_deduction', required=True)
@@ -3854,7 +4237,7 @@ def compute_federal_total_tax(inputs: dict, policy: dict) -> Decimal:
 
     # Form 1040 Line 11: Adjusted gross income
     line_11_agi_override = tag_total(index, 'form_1040_line_11_adjusted_gross_income')
-    if line_11_agi_override != Decimal('0'):
+    if line_11_agi_override:
         line_11_agi = round_to_dollars(
             line_11_agi_override
         )
@@ -3872,7 +4255,7 @@ def compute_federal_total_tax(inputs: dict, policy: dict) -> Decimal:
     # Form 1040 Lines 12, 14, 15: Deductions and taxable income
     line_12_deduction_override_items = tag_total(index, 'form_1040_line_12_deductions')
     line_12_deduction_override = None
-    if line_12_deduction_override_items != Decimal('0'):
+    if line_12_deduction_override_items:
         # Schedule A line 5e SALT is formula-driven: min(line 5d, SALT cap).
         # Use the same capped state/local/foreign tax amount already computed for
         # Form 8960 line 9b to avoid hardcoding a return placeholder input.
@@ -3887,7 +4270,7 @@ def compute_federal_total_tax(inputs: dict, policy: dict) -> Decimal:
     line_13_qbi_direct = tag_total(index, 'form_1040_line_13_qbi_deduction')
     line_13_qbi_section_199a_dividends = tag_total(index, 'form_1099_div_box_5_section_199a_dividends')
     line_13_qbi_deduction = line_13_qbi_direct + round_to_dollars(
-        line_13_qbi_section_199a_dividends * Decimal('0.20')
+        line_13_qbi_section_199a_dividends * _SECTION_199A_DIVIDENDS_RATE
     )
     line_14_total_deductions = federal_form_1040_line_14_total_deductions(
         line_12_standard_deduction,
@@ -3930,7 +4313,7 @@ def compute_federal_total_tax(inputs: dict, policy: dict) -> Decimal:
 
     # Form 1040 Line 16 and 18: Tax and amounts
     line_16_tax_input = tag_total(index, 'form_1040_line_16_tax')
-    if line_16_tax_input != Decimal('0'):
+    if line_16_tax_input:
         line_16_tax = federal_form_1040_line_16_tax(
             line_16_tax_input
         )
@@ -3953,83 +4336,85 @@ def compute_federal_total_tax(inputs: dict, policy: dict) -> Decimal:
     # Form 1040 Line 24: Total tax (final result)
     total_tax = federal_1040_line_24_total_tax(line_22_tax_after_credits, line_23_other_taxes)
 
-    _check_compute_line('federal.schedule_se.line_2_schedule_c_and_k1_profit', line_2_sched_c_k1)
-    _check_compute_line('federal.schedule_se.line_6_total_se_earnings', line_6_se_earnings)
-    _check_compute_line('federal.schedule_se.line_10_social_security_portion', line_10_ss_tax)
-    _check_compute_line('federal.schedule_se.line_11_medicare_portion', line_11_medicare)
-    _check_compute_line('federal.schedule_se.line_12_self_employment_tax', line_12_se_tax)
-
-    _check_compute_line('federal.schedule_1.line_5_rental_real_estate_income', line_5_schedule_1_rental_income)
-    _check_compute_line('federal.schedule_1.line_10_additional_income', line_10_schedule_1_additional_income)
-    _check_compute_line('federal.schedule_1.line_15_deductible_self_employment_tax', line_15_deductible_se_tax)
-    _check_compute_line('federal.schedule_1.line_16_self_employed_retirement_contributions', line_16_retirement)
-    _check_compute_line('federal.schedule_1.line_17_self_employed_health_insurance', line_17_health_insurance)
-    _check_compute_line('federal.schedule_1.line_26_adjustments_to_income', line_26_adjustments)
-
-    _check_compute_line('federal.form_8959.line_18_additional_medicare_tax', line_11_add_medicare)
-
-    _check_compute_line('federal.schedule_b.line_1_taxable_interest', line_1_sched_b_interest)
-    _check_compute_line('federal.schedule_b.line_6_ordinary_dividends', line_6_sched_b_ordinary_dividends)
-
-    _check_compute_line('federal.schedule_e.line_29a_total_nonpassive_income', line_29a_nonpassive_income)
-    _check_compute_line('federal.schedule_e.line_29b_total_nonpassive_loss_allowed', line_29b_nonpassive_loss_allowed)
-    _check_compute_line('federal.schedule_e.line_29b_total_section_179_deduction', line_29b_section_179_deduction)
-    _check_compute_line('federal.schedule_e.line_30_total_income', line_30_total_income)
-    _check_compute_line('federal.schedule_e.line_31_total_losses', line_31_total_losses)
-    _check_compute_line('federal.schedule_e.line_32_total_partnership_income', line_32_total_partnership_income)
-
-    _check_compute_line('federal.form_6781.line_7_total_gain_loss_1256', form_6781_line_7_total)
-    _check_compute_line('federal.form_6781.line_8_short_term_portion', form_6781_line_8_short_term)
-    _check_compute_line('federal.form_6781.line_9_long_term_portion', form_6781_line_9_long_term)
-
-    _check_compute_line('federal.schedule_d.line_1a_short_term_gain', schedule_d_line_1a)
-    _check_compute_line('federal.schedule_d.line_3_short_term_section_1061_adjustment', schedule_d_line_3)
-    _check_compute_line('federal.schedule_d.line_4_short_term_from_6781', schedule_d_line_4)
-    _check_compute_line('federal.schedule_d.line_5_short_term_k1_gain', schedule_d_line_5)
-    _check_compute_line('federal.schedule_d.line_7_net_short_term_gain', schedule_d_line_7)
-    _check_compute_line('federal.schedule_d.line_10_long_term_section_1061_adjustment', schedule_d_line_10)
-    _check_compute_line('federal.schedule_d.line_11_long_term_from_6781_and_4797', schedule_d_line_11)
-    _check_compute_line('federal.schedule_d.line_12_long_term_k1_gain', schedule_d_line_12)
-    _check_compute_line('federal.schedule_d.line_15_net_long_term_gain', schedule_d_line_15)
-    _check_compute_line('federal.schedule_d.line_16_net_capital_gain', schedule_d_line_16)
-
-    _check_compute_line('federal.form_8960.line_1_taxable_interest', line_1_taxable_interest)
-    _check_compute_line('federal.form_8960.line_2_ordinary_dividends', line_2_ordinary_dividends)
-    _check_compute_line('federal.form_8960.line_4a_rental_real_estate_royalties_partnerships', line_4a_rentals_partnerships)
-    _check_compute_line('federal.form_8960.line_4b_adjustment_nonsection_1411', line_4b_adjustment)
-    _check_compute_line('federal.form_8960.line_4c_net_income_from_rentals', line_4c_net_income)
-    _check_compute_line('federal.form_8960.line_5a_net_gain_loss_disposition', line_5a_net_gain)
-    _check_compute_line('federal.form_8960.line_5d_net_gain_loss_disposition', line_5d_net_gain)
-    _check_compute_line('federal.form_8960.line_8_total_investment_income', line_8_total_investment_income)
-    _check_compute_line('federal.form_8960.line_9a_investment_interest_expense', line_9a_investment_interest_expense)
-    _check_compute_line('federal.form_8960.line_9b_state_local_foreign_income_tax', line_9b_state_local_foreign_income_tax)
-    _check_compute_line('federal.form_8960.line_9c_misc_investment_expenses', line_9c_misc_investment_expenses)
-    _check_compute_line('federal.form_8960.line_12_net_investment_income', line_12_net_investment_income)
-    _check_compute_line('federal.form_8960.line_13_modified_adjusted_gross_income', line_13_modified_agi)
-    _check_compute_line('federal.form_8960.line_15_modified_agi_over_threshold', line_15_agi_over_threshold)
-    _check_compute_line('federal.form_8960.line_16_smaller_of_line_12_or_15', line_16_niit_base)
-    _check_compute_line('federal.form_8960.line_17_net_investment_income_tax', line_17_niit)
-
-    _check_compute_line('federal.schedule_2.line_12_net_investment_income_tax', line_12_niit)
-    _check_compute_line('federal.schedule_2.line_21_other_taxes', line_21_other_taxes)
-
-    _check_compute_line('federal.form_1040.line_1z_wages', line_1z_wages)
-    _check_compute_line('federal.form_1040.line_3a_qualified_dividends', line_3a_qualified_dividends)
-    _check_compute_line('federal.form_1040.line_5b_pensions_annuities', line_5b_pensions)
-    _check_compute_line('federal.form_1040.line_9_total_income', line_9_total_income)
-    _check_compute_line('federal.form_1040.line_10_adjustments_to_income', line_26_adjustments)
-    _check_compute_line('federal.form_1040.line_11_adjusted_gross_income', line_11_agi)
-    _check_compute_line('federal.form_1040.line_12_standard_deduction', line_12_standard_deduction)
-    _check_compute_line('federal.form_1040.line_14_total_deductions', line_14_total_deductions)
-    _check_compute_line('federal.form_1040.line_15_taxable_income', line_15_taxable_income)
-    _check_compute_line('federal.form_1040_qualified_dividends_capital_gain_worksheet.line_25_tax_on_all_income', worksheet_line_25)
-    _check_compute_line('federal.form_1040.line_16_tax', line_16_tax)
-    _check_compute_line('federal.form_1040.line_18_tax_and_amounts', line_18_tax_and_amounts)
-    _check_compute_line('federal.form_1040.line_21_total_credits', line_21_total_credits)
-    _check_compute_line('federal.form_1040.line_22_tax_after_credits', line_22_tax_after_credits)
-    _check_compute_line('federal.form_1040.line_23_other_taxes', line_23_other_taxes)
-    _check_compute_line('federal.form_1040.line_24_total_tax', total_tax)
-    _check_compute_line('federal.compute_total_tax', total_tax)
+    # Checks are off outside tests; skip the whole block with one flag test.
+    if _COMPUTE_CHECKS_ENABLED:
+        _check_compute_line('federal.schedule_se.line_2_schedule_c_and_k1_profit', line_2_sched_c_k1)
+        _check_compute_line('federal.schedule_se.line_6_total_se_earnings', line_6_se_earnings)
+        _check_compute_line('federal.schedule_se.line_10_social_security_portion', line_10_ss_tax)
+        _check_compute_line('federal.schedule_se.line_11_medicare_portion', line_11_medicare)
+        _check_compute_line('federal.schedule_se.line_12_self_employment_tax', line_12_se_tax)
+
+        _check_compute_line('federal.schedule_1.line_5_rental_real_estate_income', line_5_schedule_1_rental_income)
+        _check_compute_line('federal.schedule_1.line_10_additional_income', line_10_schedule_1_additional_income)
+        _check_compute_line('federal.schedule_1.line_15_deductible_self_employment_tax', line_15_deductible_se_tax)
+        _check_compute_line('federal.schedule_1.line_16_self_employed_retirement_contributions', line_16_retirement)
+        _check_compute_line('federal.schedule_1.line_17_self_employed_health_insurance', line_17_health_insurance)
+        _check_compute_line('federal.schedule_1.line_26_adjustments_to_income', line_26_adjustments)
+
+        _check_compute_line('federal.form_8959.line_18_additional_medicare_tax', line_11_add_medicare)
+
+        _check_compute_line('federal.schedule_b.line_1_taxable_interest', line_1_sched_b_interest)
+        _check_compute_line('federal.schedule_b.line_6_ordinary_dividends', line_6_sched_b_ordinary_dividends)
+
+        _check_compute_line('federal.schedule_e.line_29a_total_nonpassive_income', line_29a_nonpassive_income)
+        _check_compute_line('federal.schedule_e.line_29b_total_nonpassive_loss_allowed', line_29b_nonpassive_loss_allowed)
+        _check_compute_line('federal.schedule_e.line_29b_total_section_179_deduction', line_29b_section_179_deduction)
+        _check_compute_line('federal.schedule_e.line_30_total_income', line_30_total_income)
+        _check_compute_line('federal.schedule_e.line_31_total_losses', line_31_total_losses)
+        _check_compute_line('federal.schedule_e.line_32_total_partnership_income', line_32_total_partnership_income)
+
+        _check_compute_line('federal.form_6781.line_7_total_gain_loss_1256', form_6781_line_7_total)
+        _check_compute_line('federal.form_6781.line_8_short_term_portion', form_6781_line_8_short_term)
+        _check_compute_line('federal.form_6781.line_9_long_term_portion', form_6781_line_9_long_term)
+
+        _check_compute_line('federal.schedule_d.line_1a_short_term_gain', schedule_d_line_1a)
+        _check_compute_line('federal.schedule_d.line_3_short_term_section_1061_adjustment', schedule_d_line_3)
+        _check_compute_line('federal.schedule_d.line_4_short_term_from_6781', schedule_d_line_4)
+        _check_compute_line('federal.schedule_d.line_5_short_term_k1_gain', schedule_d_line_5)
+        _check_compute_line('federal.schedule_d.line_7_net_short_term_gain', schedule_d_line_7)
+        _check_compute_line('federal.schedule_d.line_10_long_term_section_1061_adjustment', schedule_d_line_10)
+        _check_compute_line('federal.schedule_d.line_11_long_term_from_6781_and_4797', schedule_d_line_11)
+        _check_compute_line('federal.schedule_d.line_12_long_term_k1_gain', schedule_d_line_12)
+        _check_compute_line('federal.schedule_d.line_15_net_long_term_gain', schedule_d_line_15)
+        _check_compute_line('federal.schedule_d.line_16_net_capital_gain', schedule_d_line_16)
+
+        _check_compute_line('federal.form_8960.line_1_taxable_interest', line_1_taxable_interest)
+        _check_compute_line('federal.form_8960.line_2_ordinary_dividends', line_2_ordinary_dividends)
+        _check_compute_line('federal.form_8960.line_4a_rental_real_estate_royalties_partnerships', line_4a_rentals_partnerships)
+        _check_compute_line('federal.form_8960.line_4b_adjustment_nonsection_1411', line_4b_adjustment)
+        _check_compute_line('federal.form_8960.line_4c_net_income_from_rentals', line_4c_net_income)
+        _check_compute_line('federal.form_8960.line_5a_net_gain_loss_disposition', line_5a_net_gain)
+        _check_compute_line('federal.form_8960.line_5d_net_gain_loss_disposition', line_5d_net_gain)
+        _check_compute_line('federal.form_8960.line_8_total_investment_income', line_8_total_investment_income)
+        _check_compute_line('federal.form_8960.line_9a_investment_interest_expense', line_9a_investment_interest_expense)
+        _check_compute_line('federal.form_8960.line_9b_state_local_foreign_income_tax', line_9b_state_local_foreign_income_tax)
+        _check_compute_line('federal.form_8960.line_9c_misc_investment_expenses', line_9c_misc_investment_expenses)
+        _check_compute_line('federal.form_8960.line_12_net_investment_income', line_12_net_investment_income)
+        _check_compute_line('federal.form_8960.line_13_modified_adjusted_gross_income', line_13_modified_agi)
+        _check_compute_line('federal.form_8960.line_15_modified_agi_over_threshold', line_15_agi_over_threshold)
+        _check_compute_line('federal.form_8960.line_16_smaller_of_line_12_or_15', line_16_niit_base)
+        _check_compute_line('federal.form_8960.line_17_net_investment_income_tax', line_17_niit)
+
+        _check_compute_line('federal.schedule_2.line_12_net_investment_income_tax', line_12_niit)
+        _check_compute_line('federal.schedule_2.line_21_other_taxes', line_21_other_taxes)
+
+        _check_compute_line('federal.form_1040.line_1z_wages', line_1z_wages)
+        _check_compute_line('federal.form_1040.line_3a_qualified_dividends', line_3a_qualified_dividends)
+        _check_compute_line('federal.form_1040.line_5b_pensions_annuities', line_5b_pensions)
+        _check_compute_line('federal.form_1040.line_9_total_income', line_9_total_income)
+        _check_compute_line('federal.form_1040.line_10_adjustments_to_income', line_26_adjustments)
+        _check_compute_line('federal.form_1040.line_11_adjusted_gross_income', line_11_agi)
+        _check_compute_line('federal.form_1040.line_12_standard_deduction', line_12_standard_deduction)
+        _check_compute_line('federal.form_1040.line_14_total_deductions', line_14_total_deductions)
+        _check_compute_line('federal.form_1040.line_15_taxable_income', line_15_taxable_income)
+        _check_compute_line('federal.form_1040_qualified_dividends_capital_gain_worksheet.line_25_tax_on_all_income', worksheet_line_25)
+        _check_compute_line('federal.form_1040.line_16_tax', line_16_tax)
+        _check_compute_line('federal.form_1040.line_18_tax_and_amounts', line_18_tax_and_amounts)
+        _check_compute_line('federal.form_1040.line_21_total_credits', line_21_total_credits)
+        _check_compute_line('federal.form_1040.line_22_tax_after_credits', line_22_tax_after_credits)
+        _check_compute_line('federal.form_1040.line_23_other_taxes', line_23_other_taxes)
+        _check_compute_line('federal.form_1040.line_24_total_tax', total_tax)
+        _check_compute_line('federal.compute_total_tax', total_tax)
 
     return total_tax
 
@@ -4044,6 +4429,9 @@ def compute_ny_total_tax(inputs: dict, policy: dict) -> Decimal:
 
     Form/Line: NY IT-201, line 62 (final result)
 
+    Policy values are parsed once per policy dict and cached by identity;
+    call clear_policy_cache() after mutating a policy dict in place.
+
     Args:
         inputs: Input data dict containing all factual values
         policy: Policy configuration dict containing tax law parameters
@@ -4051,7 +4439,13 @@ def compute_ny_total_tax(inputs: dict, policy: dict) -> Decimal:
     Returns:
         Total NY tax amount (IT-201 line 62)
     """
-    index = build_inputs_index(inputs)
+    return _ny_total_tax_from_index(build_inputs_index(inputs), policy)
+
+
+def _ny_total_tax_from_index(index: dict, policy: dict) -> Decimal:
+    """
+    Compute the NY total tax from an inputs index built by build_inputs_index.
+    """
     # === Federal intermediates needed by NY ===
 
     # K-1 inputs
@@ -4195,14 +4589,14 @@ def compute_ny_total_tax(inputs: dict, policy: dict) -> Decimal:
     it201_line_19 = ny_it201_line_19_federal_agi(it201_line_17, it201_line_18)
 
     # IT-225: NY additions
-    it225_line_1a_items = [{'amount': str(tag_total(index, 'ny_it_201_att_line_12_amount'))}]
+    it225_line_1a_items = [{'amount': tag_total(index, 'ny_it_201_att_line_12_amount')}]
     it225_line_1a = ny_it225_line_1a_additions(it225_line_1a_items)
     it225_line_2 = ny_it225_line_2_total_part1_additions(it225_line_1a)
     it225_line_4 = ny_it225_line_4_total_part1_additions(it225_line_2)
 
-    it225_line_5a_items = [{'amount': str(tag_total(index, 'ny_it_225_line_5a_addition'))}]
+    it225_line_5a_items = [{'amount': tag_total(index, 'ny_it_225_line_5a_addition')}]
     it225_line_5a = ny_it225_line_5a_additions(it225_line_5a_items)
-    it225_line_5b_items = [{'amount': str(tag_total(index, 'ny_it_225_line_5b_addition'))}]
+    it225_line_5b_items = [{'amount': tag_total(index, 'ny_it_225_line_5b_addition')}]
     it225_line_5b = ny_it225_line_5b_additions(it225_line_5b_items)
     it225_line_6 = ny_it225_line_6_total_part2_additions(it225_line_5a, it225_line_5b)
     it225_line_8 = ny_it225_line_8_total_part2_additions(it225_line_6)
@@ -4249,11 +4643,11 @@ def compute_ny_total_tax(inputs: dict, policy: dict) -> Decimal:
 
     # IT-112-R: Resident credit
     it112r_line_22_total = ny_it112r_line_22_total_income(it201_line_33)
-    it112r_line_22_other_state_items = [{'amount': str(tag_total(index, 'ny_it_112_r_line_22_other_state_income'))}]
+    it112r_line_22_other_state_items = [{'amount': tag_total(index, 'ny_it_112_r_line_22_other_state_income')}]
     it112r_line_22_other = ny_it112r_line_22_other_state_income(
         it112r_line_22_other_state_items
     )
-    it112r_line_24_items = [{'amount': str(tag_total(index, 'ny_it_112_r_line_24_other_state_tax'))}]
+    it112r_line_24_items = [{'amount': tag_total(index, 'ny_it_112_r_line_24_other_state_tax')}]
     it112r_line_24 = ny_it112r_line_24_total_other_state_tax(it112r_line_24_items)
     it112r_line_26 = ny_it112r_line_26_ratio(it112r_line_22_total, it112r_line_22_other)
     it112r_line_27 = ny_it112r_line_27_ny_tax_times_ratio(it201_line_39, it112r_line_26)
@@ -4278,7 +4672,7 @@ def compute_ny_total_tax(inputs: dict, policy: dict) -> Decimal:
     it201_line_49 = ny_it201_line_49_nyc_tax_after_household_credit(it201_line_47a)
 
     # IT-219: UBT credit
-    ubt_credit_items = [{'amount': str(tag_total(index, 'ny_it_219_line_7_ubt_credit'))}]
+    ubt_credit_items = [{'amount': tag_total(index, 'ny_it_219_line_7_ubt_credit')}]
     it219_line_7 = ny_it219_line_7_beneficiary_ubt_credit(ubt_credit_items)
     it219_line_8 = ny_it219_line_8_total_ubt_credit(it219_line_7)
     it219_line_9 = ny_it219_line_9_taxable_income(it201_line_47)
@@ -4313,65 +4707,67 @@ def compute_ny_total_tax(inputs: dict, policy: dict) -> Decimal:
     it201_line_61 = ny_it201_line_61_total_taxes(it201_line_46, it201_line_58)
     it201_line_62 = ny_it201_line_62_total_taxes(it201_line_61)
 
-    _check_compute_line('ny.it_201.line_17_total_federal_income', it201_line_17)
-    _check_compute_line('ny.it_201.line_18_federal_adjustments', it201_line_18)
-    _check_compute_line('ny.it_201.line_19_federal_agi', it201_line_19)
-    _check_compute_line('ny.it_225.line_1a_additions', it225_line_1a)
-    _check_compute_line('ny.it_225.line_2_total_part1_additions', it225_line_2)
-    _check_compute_line('ny.it_225.line_4_total_part1_additions', it225_line_4)
-    _check_compute_line('ny.it_225.line_5a_additions', it225_line_5a)
-    _check_compute_line('ny.it_225.line_5b_additions', it225_line_5b)
-    _check_compute_line('ny.it_225.line_6_total_part2_additions', it225_line_6)
-    _check_compute_line('ny.it_225.line_8_total_part2_additions', it225_line_8)
-    _check_compute_line('ny.it_225.line_9_total_additions', it225_line_9)
-    _check_compute_line('ny.it_201.line_23_other_additions', it201_line_23)
-    _check_compute_line('ny.it_201.line_24_ny_total_income', it201_line_24)
-    _check_compute_line('ny.it_201.line_28_us_gov_bond_interest', it201_line_28)
-    _check_compute_line('ny.it_201.line_32_ny_total_subtractions', it201_line_32)
-    _check_compute_line('ny.it_201.line_33_ny_adjusted_gross_income', it201_line_33)
-    _check_compute_line('ny.it_201.line_34_standard_deduction', it201_line_34)
-    _check_compute_line('ny.it_201.line_35_ny_taxable_income_before_exemptions', it201_line_35)
-    _check_compute_line('ny.it_201.line_36_dependent_exemptions', it201_line_36)
-    _check_compute_line('ny.it_201.line_38_ny_taxable_income', it201_line_38)
-    _check_compute_line('ny.it_201.statement_2_tax_computation_worksheet_4.line_3_tax_from_rate_schedule', stmt2_line_3)
-    _check_compute_line('ny.it_201.statement_2_tax_computation_worksheet_4.line_4_recapture_base_amount', stmt2_line_4)
-    _check_compute_line('ny.it_201.statement_2_tax_computation_worksheet_4.line_9_incremental_benefit_addback', stmt2_line_9)
-    _check_compute_line('ny.it_201.line_39_nys_tax_on_line_38', it201_line_39)
-    _check_compute_line('ny.it_112_r.line_22_total_income', it112r_line_22_total)
-    _check_compute_line('ny.it_112_r.line_22_other_state_income', it112r_line_22_other)
-    _check_compute_line('ny.it_112_r.line_24_total_other_state_tax', it112r_line_24)
-    _check_compute_line('ny.it_112_r.line_26_ratio', it112r_line_26)
-    _check_compute_line('ny.it_112_r.line_27_ny_tax_times_ratio', it112r_line_27)
-    _check_compute_line('ny.it_112_r.line_28_smaller_of_line24_or_27', it112r_line_28)
-    _check_compute_line('ny.it_112_r.line_30_total_credit', it112r_line_30)
-    _check_compute_line('ny.it_112_r.line_34_resident_credit', it112r_line_34)
-    _check_compute_line('ny.it_201.line_41_resident_credit', it201_line_41)
-    _check_compute_line('ny.it_201.line_43_nys_credits_total', it201_line_43)
-    _check_compute_line('ny.it_201.line_44_ny_state_tax_after_credits', it201_line_44)
-    _check_compute_line('ny.it_201.line_46_total_ny_state_taxes', it201_line_46)
-    _check_compute_line('ny.it_201.line_47_nyc_taxable_income', it201_line_47)
-    _check_compute_line('ny.it_201.line_47a_nyc_resident_tax', it201_line_47a)
-    _check_compute_line('ny.it_201.line_49_nyc_tax_after_household_credit', it201_line_49)
-    _check_compute_line('ny.it_219.line_7_beneficiary_ubt_credit', it219_line_7)
-    _check_compute_line('ny.it_219.line_8_total_ubt_credit', it219_line_8)
-    _check_compute_line('ny.it_219.line_9_taxable_income', it219_line_9)
-    _check_compute_line('ny.it_219.line_10_income_factor', it219_line_10)
-    _check_compute_line('ny.it_219.line_11_income_based_credit', it219_line_11)
-    _check_compute_line('ny.it_219.line_15_total_tax', it219_line_15)
-    _check_compute_line('ny.it_219.line_16_resident_ubt_credit', it219_line_16)
-    _check_compute_line('ny.it_201_att.line_8_nyc_resident_ubt_credit', att_line_8)
-    _check_compute_line('ny.it_201_att.line_10_total_nyc_nonrefundable_credits', att_line_10)
-    _check_compute_line('ny.it_201.line_52_nyc_tax_before_credits', it201_line_52)
-    _check_compute_line('ny.it_201.line_53_nyc_nonrefundable_credits', it201_line_53)
-    _check_compute_line('ny.it_201.line_54_nyc_tax_after_credits', it201_line_54)
-    _check_compute_line('ny.it_2105_9.worksheet_4a_line_1_net_earnings_zone_1', worksheet_4a_line_1)
-    _check_compute_line('ny.it_201.line_54a_mctmt_net_earnings_zone_1', it201_line_54a)
-    _check_compute_line('ny.it_201.line_54c_mctmt_zone_1', it201_line_54c)
-    _check_compute_line('ny.it_201.line_54e_mctmt_total', it201_line_54e)
-    _check_compute_line('ny.it_201.line_58_total_nyc_yonkers_mctmt', it201_line_58)
-    _check_compute_line('ny.it_201.line_61_total_taxes', it201_line_61)
-    _check_compute_line('ny.it_201.line_62_total_taxes', it201_line_62)
-    _check_compute_line('ny.compute_total_tax', it201_line_62)
+    # Checks are off outside tests; skip the whole block with one flag test.
+    if _COMPUTE_CHECKS_ENABLED:
+        _check_compute_line('ny.it_201.line_17_total_federal_income', it201_line_17)
+        _check_compute_line('ny.it_201.line_18_federal_adjustments', it201_line_18)
+        _check_compute_line('ny.it_201.line_19_federal_agi', it201_line_19)
+        _check_compute_line('ny.it_225.line_1a_additions', it225_line_1a)
+        _check_compute_line('ny.it_225.line_2_total_part1_additions', it225_line_2)
+        _check_compute_line('ny.it_225.line_4_total_part1_additions', it225_line_4)
+        _check_compute_line('ny.it_225.line_5a_additions', it225_line_5a)
+        _check_compute_line('ny.it_225.line_5b_additions', it225_line_5b)
+        _check_compute_line('ny.it_225.line_6_total_part2_additions', it225_line_6)
+        _check_compute_line('ny.it_225.line_8_total_part2_additions', it225_line_8)
+        _check_compute_line('ny.it_225.line_9_total_additions', it225_line_9)
+        _check_compute_line('ny.it_201.line_23_other_additions', it201_line_23)
+        _check_compute_line('ny.it_201.line_24_ny_total_income', it201_line_24)
+        _check_compute_line('ny.it_201.line_28_us_gov_bond_interest', it201_line_28)
+        _check_compute_line('ny.it_201.line_32_ny_total_subtractions', it201_line_32)
+        _check_compute_line('ny.it_201.line_33_ny_adjusted_gross_income', it201_line_33)
+        _check_compute_line('ny.it_201.line_34_standard_deduction', it201_line_34)
+        _check_compute_line('ny.it_201.line_35_ny_taxable_income_before_exemptions', it201_line_35)
+        _check_compute_line('ny.it_201.line_36_dependent_exemptions', it201_line_36)
+        _check_compute_line('ny.it_201.line_38_ny_taxable_income', it201_line_38)
+        _check_compute_line('ny.it_201.statement_2_tax_computation_worksheet_4.line_3_tax_from_rate_schedule', stmt2_line_3)
+        _check_compute_line('ny.it_201.statement_2_tax_computation_worksheet_4.line_4_recapture_base_amount', stmt2_line_4)
+        _check_compute_line('ny.it_201.statement_2_tax_computation_worksheet_4.line_9_incremental_benefit_addback', stmt2_line_9)
+        _check_compute_line('ny.it_201.line_39_nys_tax_on_line_38', it201_line_39)
+        _check_compute_line('ny.it_112_r.line_22_total_income', it112r_line_22_total)
+        _check_compute_line('ny.it_112_r.line_22_other_state_income', it112r_line_22_other)
+        _check_compute_line('ny.it_112_r.line_24_total_other_state_tax', it112r_line_24)
+        _check_compute_line('ny.it_112_r.line_26_ratio', it112r_line_26)
+        _check_compute_line('ny.it_112_r.line_27_ny_tax_times_ratio', it112r_line_27)
+        _check_compute_line('ny.it_112_r.line_28_smaller_of_line24_or_27', it112r_line_28)
+        _check_compute_line('ny.it_112_r.line_30_total_credit', it112r_line_30)
+        _check_compute_line('ny.it_112_r.line_34_resident_credit', it112r_line_34)
+        _check_compute_line('ny.it_201.line_41_resident_credit', it201_line_41)
+        _check_compute_line('ny.it_201.line_43_nys_credits_total', it201_line_43)
+        _check_compute_line('ny.it_201.line_44_ny_state_tax_after_credits', it201_line_44)
+        _check_compute_line('ny.it_201.line_46_total_ny_state_taxes', it201_line_46)
+        _check_compute_line('ny.it_201.line_47_nyc_taxable_income', it201_line_47)
+        _check_compute_line('ny.it_201.line_47a_nyc_resident_tax', it201_line_47a)
+        _check_compute_line('ny.it_201.line_49_nyc_tax_after_household_credit', it201_line_49)
+        _check_compute_line('ny.it_219.line_7_beneficiary_ubt_credit', it219_line_7)
+        _check_compute_line('ny.it_219.line_8_total_ubt_credit', it219_line_8)
+        _check_compute_line('ny.it_219.line_9_taxable_income', it219_line_9)
+        _check_compute_line('ny.it_219.line_10_income_factor', it219_line_10)
+        _check_compute_line('ny.it_219.line_11_income_based_credit', it219_line_11)
+        _check_compute_line('ny.it_219.line_15_total_tax', it219_line_15)
+        _check_compute_line('ny.it_219.line_16_resident_ubt_credit', it219_line_16)
+        _check_compute_line('ny.it_201_att.line_8_nyc_resident_ubt_credit', att_line_8)
+        _check_compute_line('ny.it_201_att.line_10_total_nyc_nonrefundable_credits', att_line_10)
+        _check_compute_line('ny.it_201.line_52_nyc_tax_before_credits', it201_line_52)
+        _check_compute_line('ny.it_201.line_53_nyc_nonrefundable_credits', it201_line_53)
+        _check_compute_line('ny.it_201.line_54_nyc_tax_after_credits', it201_line_54)
+        _check_compute_line('ny.it_2105_9.worksheet_4a_line_1_net_earnings_zone_1', worksheet_4a_line_1)
+        _check_compute_line('ny.it_201.line_54a_mctmt_net_earnings_zone_1', it201_line_54a)
+        _check_compute_line('ny.it_201.line_54c_mctmt_zone_1', it201_line_54c)
+        _check_compute_line('ny.it_201.line_54e_mctmt_total', it201_line_54e)
+        _check_compute_line('ny.it_201.line_58_total_nyc_yonkers_mctmt', it201_line_58)
+        _check_compute_line('ny.it_201.line_61_total_taxes', it201_line_61)
+        _check_compute_line('ny.it_201.line_62_total_taxes', it201_line_62)
+        _check_compute_line('ny.compute_total_tax', it201_line_62)
 
     return it201_line_62
 
@@ -4380,11 +4776,15 @@ def compute_all_taxes(inputs: dict, policy: dict) -> dict:
     """
     Compute federal and NY total taxes from raw inputs.
 
+    Policy values are parsed once per policy dict and cached by identity;
+    call clear_policy_cache() after mutating a policy dict in place.
+
     Returns:
         Dict with 'federal', 'ny', and 'total' keys.
     """
-    federal = compute_federal_total_tax(inputs, policy)
-    ny = compute_ny_total_tax(inputs, policy)
+    index = build_inputs_index(inputs)
+    federal = _federal_total_tax_from_index(index, policy)
+    ny = _ny_total_tax_from_index(index, policy)
     return {
         'federal': federal,
         'ny': ny,
@@ -4394,42 +4794,36 @@ def compute_all_taxes(inputs: dict, policy: dict) -> dict:
 
 def _marginal_state_totals() -> dict:
     return {
-        'NY': compute_ny_total_tax,
+        'NY': _ny_total_tax_from_index,
     }
 
 
-def _compute_marginals(plus_inputs: dict, minus_inputs: dict, policy: dict, delta: Decimal) -> tuple:
+def _compute_marginals(plus_index: dict, minus_index: dict, policy: dict, delta: Decimal) -> tuple:
     state_totals = _marginal_state_totals()
-
-    federal_plus = compute_federal_total_tax(plus_inputs, policy)
-    federal_minus = compute_federal_total_tax(minus_inputs, policy)
+    federal_plus = _federal_total_tax_from_index(plus_index, policy)
+    federal_minus = _federal_total_tax_from_index(minus_index, policy)
     marginal_federal = (federal_plus - federal_minus) / (delta * 2)
 
     state_marginals = []
     for state, func in state_totals.items():
-        state_plus = func(plus_inputs, policy)
-        state_minus = func(minus_inputs, policy)
+        state_plus = func(plus_index, policy)
+        state_minus = func(minus_index, policy)
         state_marginals.append((state_plus - state_minus) / (delta * 2))
 
-    marginal_total = marginal_federal + sum(state_marginals, Decimal('0'))
+    marginal_total = marginal_federal + sum(state_marginals, _ZERO)
     return marginal_federal, state_marginals, marginal_total
 
 
-def marginal_rate_table_by_input(inputs: dict, policy: dict, delta: Decimal = Decimal('1000')) -> str:
-    """
-    Compute marginal tax rates by input item using numerical differentiation.
-    """
-    import copy
-    from pathlib import Path
-
-    if delta <= 0:
-        raise ValueError('delta must be positive')
-
+def _marginal_rows_by_input(inputs: dict, policy: dict, delta: Decimal) -> Iterator[str]:
     state_totals = _marginal_state_totals()
     headers = ['Source', 'Path', 'Tags', 'Explanation', 'Amount', 'Marginal Federal']
     headers.extend([f'Marginal {state}' for state in state_totals])
     headers.append('Marginal Total')
-    lines = ['|'.join(headers)]
+    yield '|'.join(headers)
+
+    # Each perturbation changes one item; patch its tags into the baseline
+    # index instead of re-indexing every input.
+    baseline_index = build_inputs_index(inputs)
 
     for source, items in inputs.items():
         if not isinstance(items, list):
@@ -4449,16 +4843,14 @@ def marginal_rate_table_by_input(inputs: dict, policy: dict, delta: Decimal = De
                 row = [source_filename, path, tags, explanation, amount_str, '']
                 row.extend([''] * len(state_totals))
                 row.append('')
-                lines.append('|'.join(row))
+                yield '|'.join(row)
                 continue
 
-            plus_inputs = copy.deepcopy(inputs)
-            minus_inputs = copy.deepcopy(inputs)
-            plus_inputs[source][i]['Amount'] = str(amount + delta)
-            minus_inputs[source][i]['Amount'] = str(amount - delta)
+            plus_index = _index_with_item(baseline_index, item, {**item, 'Amount': str(amount + delta)})
+            minus_index = _index_with_item(baseline_index, item, {**item, 'Amount': str(amount - delta)})
 
             marginal_federal, state_marginals, marginal_total = _compute_marginals(
-                plus_inputs, minus_inputs, policy, delta
+                plus_index, minus_index, policy, delta
             )
 
             row = [
@@ -4471,26 +4863,39 @@ def marginal_rate_table_by_input(inputs: dict, policy: dict, delta: Decimal = De
             ]
             row.extend(str(value) for value in state_marginals)
             row.append(str(marginal_total))
-            lines.append('|'.join(row))
+            yield '|'.join(row)
 
-    return '\n'.join(lines)
 
-
-def marginal_rate_table_by_tag(inputs: dict, policy: dict, delta: Decimal = Decimal('1000')) -> str:
-    """
-    Compute marginal tax rates by tag using numerical differentiation.
+def marginal_rate_rows_by_input(
+    inputs: dict,
+    policy: dict,
+    delta: Decimal = Decimal('1000'),
+) -> Iterator[str]:
     """
-    import copy
-    from pathlib import Path
+    Yield the by-input marginal rate table one pipe-delimited row at a time.
 
+    The header row comes first; each later row is produced as soon as its
+    marginals are computed, so callers can stream the table. delta is
+    validated when this is called, before any row is produced.
+    """
     if delta <= 0:
         raise ValueError('delta must be positive')
+    return _marginal_rows_by_input(inputs, policy, delta)
 
+
+def marginal_rate_table_by_input(inputs: dict, policy: dict, delta: Decimal = Decimal('1000')) -> str:
+    """
+    Compute marginal tax rates by input item using numerical differentiation.
+    """
+    return '\n'.join(marginal_rate_rows_by_input(inputs, policy, delta))
+
+
+def _marginal_rows_by_tag(inputs: dict, policy: dict, delta: Decimal) -> Iterator[str]:
     state_totals = _marginal_state_totals()
     headers = ['Tag', 'Num Inputs', 'Sources+Paths', 'Amount', 'Marginal Federal']
     headers.extend([f'Marginal {state}' for state in state_totals])
     headers.append('Marginal Total')
-    lines = ['|'.join(headers)]
+    yield '|'.join(headers)
 
     tagged_items: dict[str, list[dict]] = defaultdict(list)
     for source, items in inputs.items():
@@ -4510,12 +4915,14 @@ def marginal_rate_table_by_tag(inputs: dict, policy: dict, delta: Decimal = Deci
                     }
                 )
 
+    baseline_index = build_inputs_index(inputs)
+
     for tag in sorted(tagged_items.keys()):
         records = tagged_items[tag]
         num_inputs = len(records)
         source_path_parts = []
         numeric_records = []
-        total_amount = Decimal('0')
+        total_amount = _ZERO
 
         for record in records:
             item = record['item']
@@ -4538,44 +4945,61 @@ def marginal_rate_table_by_tag(inputs: dict, policy: dict, delta: Decimal = Deci
             row = [tag, str(num_inputs), sources_paths, str(total_amount), '']
             row.extend([''] * len(state_totals))
             row.append('')
-            lines.append('|'.join(row))
+            yield '|'.join(row)
             continue
 
-        plus_inputs = copy.deepcopy(inputs)
-        minus_inputs = copy.deepcopy(inputs)
-
         # Shock only the target tag via a synthetic one-tag row so we do not
-        # perturb amounts tied to other tags on shared input rows.
-        shock_source = '__MARGINAL_SHOCK__'
-        while shock_source in plus_inputs or shock_source in minus_inputs:
-            shock_source += '_X'
-        plus_inputs[shock_source] = [
-            {
-                'Tags': [tag],
-                'Amount': str(delta),
-                'Path': 'Synthetic marginal shock (+delta)',
-                'Explanation': 'Synthetic row for tag marginal calculation',
-            }
-        ]
-        minus_inputs[shock_source] = [
-            {
-                'Tags': [tag],
-                'Amount': str(-delta),
-                'Path': 'Synthetic marginal shock (-delta)',
-                'Explanation': 'Synthetic row for tag marginal calculation',
-            }
-        ]
+        # perturb amounts tied to other tags on shared input rows. The rows
+        # are appended to the baseline index rather than to a copy of inputs,
+        # so the caller's inputs stay untouched.
+        plus_shock = {
+            'Tags': [tag],
+            'Amount': str(delta),
+            'Path': 'Synthetic marginal shock (+delta)',
+            'Explanation': 'Synthetic row for tag marginal calculation',
+        }
+        minus_shock = {
+            'Tags': [tag],
+            'Amount': str(-delta),
+            'Path': 'Synthetic marginal shock (-delta)',
+            'Explanation': 'Synthetic row for tag marginal calculation',
+        }
 
         marginal_federal, state_marginals, marginal_total = _compute_marginals(
-            plus_inputs, minus_inputs, policy, delta
+            _index_with_item(baseline_index, None, plus_shock),
+            _index_with_item(baseline_index, None, minus_shock),
+            policy,
+            delta,
         )
 
         row = [tag, str(num_inputs), sources_paths, str(total_amount), str(marginal_federal)]
         row.extend(str(value) for value in state_marginals)
         row.append(str(marginal_total))
-        lines.append('|'.join(row))
+        yield '|'.join(row)
+
+
+def marginal_rate_rows_by_tag(
+    inputs: dict,
+    policy: dict,
+    delta: Decimal = Decimal('1000'),
+) -> Iterator[str]:
+    """
+    Yield the by-tag marginal rate table one pipe-delimited row at a time.
+
+    The header row comes first; each later row is produced as soon as its
+    marginals are computed, so callers can stream the table. delta is
+    validated when this is called, before any row is produced.
+    """
+    if delta <= 0:
+        raise ValueError('delta must be positive')
+    return _marginal_rows_by_tag(inputs, policy, delta)
 
-    return '\n'.join(lines)
+
+def marginal_rate_table_by_tag(inputs: dict, policy: dict, delta: Decimal = Decimal('1000')) -> str:
+    """
+    Compute marginal tax rates by tag using numerical differentiation.
+    """
+    return '\n'.join(marginal_rate_rows_by_tag(inputs, policy, delta))
 
 
 def marginal_rate_table(inputs: dict, policy: dict, delta: Decimal = Decimal('1000')) -> str:
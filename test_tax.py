@@ -3,7 +3,7 @@ Tests for tax calculations across supported tax years.
 """
 
 import json
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 from pathlib import Path
 import sys
 
@@ -17,6 +17,8 @@ if str(BASE_DIR) not in sys.path:
 from tax import (
     build_inputs_index,
     tag_total,
+    marginal_rate_table_by_input,
+    marginal_rate_table_by_tag,
     federal_schedule_se_line_2_schedule_c_and_k1_profit,
     federal_schedule_se_line_6_total_se_earnings,
     federal_schedule_se_line_10_social_security_tax,
@@ -74,6 +76,7 @@ from tax import (
     federal_form_1040_line_9_total_income,
     federal_form_1040_line_11_adjusted_gross_income,
     federal_form_1040_line_12_standard_deduction,
+    federal_form_1040_tax_computation_worksheet_tax,
     federal_form_1040_line_14_total_deductions,
     federal_form_1040_line_15_taxable_income,
     federal_form_1040_qualified_dividends_capital_gain_worksheet_line_22_tax_on_line_5,
@@ -153,6 +156,7 @@ from tax import (
     compute_federal_total_tax,
     compute_ny_total_tax,
     set_compute_checks_mode,
+    clear_policy_cache,
     round_to_dollars,
 )
 
@@ -278,6 +282,8 @@ def create_test(
     expected_path: str,
     register: bool = True,
     use_inputs_index: bool = True,
+    case_inputs: dict | None = None,
+    case_expected: dict | None = None,
 ):
     """Create a test function with common pattern abstracted away.
 
@@ -286,15 +292,26 @@ def create_test(
         func: The calculation function to test
         prepare_args: Callable that takes (inputs, policy) and returns dict of kwargs for func
         expected_path: Dot-notation path to expected value (e.g., "federal.form_1040.line_24_total_tax")
+        case_inputs: Made-up inputs for a fixed case (default: no inputs)
+        case_expected: Makes this a fixed case: maps year -> expected value, or to a
+            callable taking (inputs, policy) that computes it. Fixed cases use only the
+            public policy files and are run by test_fixed_cases()
 
     Returns:
         A test function with a `.compute()` helper for chaining results
     """
     def compute_value(year: int) -> Decimal:
-        inputs_items = load_inputs(year)
+        if case_expected is None:
+            inputs_items = load_inputs(year)
+            expected_values = load_expected(year)
+        else:
+            inputs_items = case_inputs if case_inputs is not None else {}
+            expected_values = None
         inputs_index = build_inputs_index(inputs_items)
         policy = load_policy(year)
-        expected_values = load_expected(year)
+        # Intermediate-line checks compare against the filed return; made-up
+        # case inputs have none.
+        check_lines = ENABLE_INTERNAL_COMPUTE_CHECKS and expected_values is not None
 
         # Prepare arguments for the function
         if use_inputs_index:
@@ -303,18 +320,30 @@ def create_test(
             kwargs = prepare_args(inputs_items, policy)
 
         # Call the function being tested
-        if ENABLE_INTERNAL_COMPUTE_CHECKS:
+        if check_lines:
             set_compute_checks_mode(True, expected_values, context=str(year))
         try:
             return func(**kwargs)
         finally:
-            if ENABLE_INTERNAL_COMPUTE_CHECKS:
+            if check_lines:
                 set_compute_checks_mode(False)
 
     def has_expected(year: int) -> bool:
         return expected_value_for_year(year, expected_path) is not None
 
+    def test_case():
+        global CURRENT_YEAR
+        for year, expected in case_expected.items():
+            CURRENT_YEAR = year
+            if callable(expected):
+                expected = expected(case_inputs if case_inputs is not None else {}, load_policy(year))
+            result = compute_value(year)
+            verify_and_print(f"({year}) {description}", result, expected)
+
     def test_func():
+        if case_expected is not None:
+            test_case()
+            return
         ran = False
         for year in YEARS:
             inputs_path = _inputs_path(year)
@@ -342,6 +371,7 @@ def create_test(
     test_func.compute = compute_value
     test_func.expected_path = expected_path
     test_func.description = description
+    test_func.is_case = case_expected is not None
     test_func.__test__ = False
     if register:
         register_test(expected_path, test_func)
@@ -356,6 +386,71 @@ def computed(test_func: callable) -> Decimal:
     return test_func.compute(CURRENT_YEAR)
 
 
+def for_all_years(expected) -> dict:
+    """Use the same fixed-case expected value (or callable) for every year."""
+    return {year: expected for year in YEARS}
+
+
+def marginal_table_value(table: str, key: tuple[str, ...], column: str) -> Decimal:
+    """Return a cell of a pipe-delimited marginal table.
+
+    The row is the one whose leading cells equal `key` (e.g. (tag,) or
+    (source, path)); `column` is a header name.
+    """
+    header, *rows = table.split('\n')
+    position = header.split('|').index(column)
+    for row in rows:
+        cells = row.split('|')
+        if tuple(cells[:len(key)]) == key:
+            return Decimal(cells[position])
+    raise AssertionError(f"No marginal table row for {key}")
+
+
+def with_tag_shock(tag: str) -> callable:
+    """Perturbation adding a one-tag row, as the by-tag marginal table does."""
+    def perturb(inputs: dict, amount: Decimal) -> dict:
+        return {**inputs, 'marginal_shock': [{'Tags': [tag], 'Amount': str(amount)}]}
+    return perturb
+
+
+def with_item_shift(source: str, position: int) -> callable:
+    """Perturbation shifting one item's Amount, as the by-input marginal table does."""
+    def perturb(inputs: dict, amount: Decimal) -> dict:
+        items = list(inputs[source])
+        item = items[position]
+        items[position] = {**item, 'Amount': str(Decimal(item['Amount']) + amount)}
+        return {**inputs, source: items}
+    return perturb
+
+
+def rebuilt_marginal_rate(
+    inputs: dict,
+    policy: dict,
+    perturb: callable,
+    column: str,
+    delta: Decimal = Decimal('1000'),
+) -> Decimal:
+    """Recompute one marginal rate from scratch.
+
+    Each perturbed input set goes through compute_*_total_tax, which re-runs
+    build_inputs_index, so this is the reference for the marginal tables'
+    incremental index patching.
+    """
+    plus_inputs = perturb(inputs, delta)
+    minus_inputs = perturb(inputs, -delta)
+    federal = (
+        compute_federal_total_tax(plus_inputs, policy) - compute_federal_total_tax(minus_inputs, policy)
+    ) / (delta * 2)
+    ny = (
+        compute_ny_total_tax(plus_inputs, policy) - compute_ny_total_tax(minus_inputs, policy)
+    ) / (delta * 2)
+    return {
+        'Marginal Federal': federal,
+        'Marginal NY': ny,
+        'Marginal Total': federal + ny,
+    }[column]
+
+
 def test_expected_values():
     """
     Drive tests from expected values for each year.
@@ -400,6 +495,22 @@ def test_expected_values():
         )
 
 
+def test_fixed_cases():
+    """
+    Run every registered fixed case: made-up inputs checked against the
+    public policy files.
+
+    These cover edges the filed returns in test_expected_values do not
+    reach, such as bracket boundaries and omitted optional lines.
+    """
+    cases = [test_func for test_func in TESTS_BY_EXPECTED_PATH.values() if test_func.is_case]
+    if not cases:
+        raise AssertionError("No fixed cases registered")
+    for test_func in cases:
+        test_func()
+
+
+
 # Test definitions using the abstracted pattern
 
 test_federal_schedule_se_line_2_schedule_c_and_k1_profit = create_test(
@@ -1955,7 +2066,565 @@ test_compute_ny_total_tax = create_test(
 )
 
 
+# Made-up return for the marginal-table cases: one K-1 row carries two tags,
+# one row repeats its tag, and one row has an amount that does not parse.
+MARGINAL_CASE_INPUTS = {
+    'k1.pdf': [
+        {
+            'Tags': ['schedule_se_k1_box_14a_self_employment_earnings', 'mctmt_base_ordinary_income'],
+            'Amount': '180000',
+            'Path': 'Box 14A',
+        },
+        {'Tags': ['section_179_deduction'], 'Amount': '1000', 'Path': 'Box 12'},
+        {
+            'Tags': ['mctmt_base_guaranteed_payments', 'mctmt_base_guaranteed_payments'],
+            'Amount': '10000',
+            'Path': 'Box 4a',
+        },
+        {'Tags': ['case_note_only'], 'Amount': 'see statement', 'Path': 'Note'},
+    ],
+    'other.pdf': [
+        {'Tags': ['ny_dependents_count'], 'Amount': '1', 'Path': 'Dependents'},
+    ],
+}
+
+test_marginal_by_tag_two_tag_row = create_test(
+    description="Marginal Table by Tag (tag on a two-tag row, federal)",
+    func=marginal_table_value,
+    prepare_args=lambda inputs, policy: {
+        'table': marginal_rate_table_by_tag(inputs, policy),
+        'key': ('schedule_se_k1_box_14a_self_employment_earnings',),
+        'column': 'Marginal Federal',
+    },
+    expected_path="cases.marginal.by_tag.two_tag_row_federal",
+    use_inputs_index=False,
+    case_inputs=MARGINAL_CASE_INPUTS,
+    case_expected=for_all_years(
+        lambda inputs, policy: rebuilt_marginal_rate(
+            inputs,
+            policy,
+            with_tag_shock('schedule_se_k1_box_14a_self_employment_earnings'),
+            'Marginal Federal',
+        )
+    ),
+)
+
+test_marginal_by_tag_repeated_tag = create_test(
+    description="Marginal Table by Tag (tag repeated on one row, total)",
+    func=marginal_table_value,
+    prepare_args=lambda inputs, policy: {
+        'table': marginal_rate_table_by_tag(inputs, policy),
+        'key': ('mctmt_base_guaranteed_payments',),
+        'column': 'Marginal Total',
+    },
+    expected_path="cases.marginal.by_tag.repeated_tag_total",
+    use_inputs_index=False,
+    case_inputs=MARGINAL_CASE_INPUTS,
+    case_expected=for_all_years(
+        lambda inputs, policy: rebuilt_marginal_rate(
+            inputs, policy, with_tag_shock('mctmt_base_guaranteed_payments'), 'Marginal Total'
+        )
+    ),
+)
+
+test_marginal_by_input_two_tag_row = create_test(
+    description="Marginal Table by Input (two-tag row, NY)",
+    func=marginal_table_value,
+    prepare_args=lambda inputs, policy: {
+        'table': marginal_rate_table_by_input(inputs, policy),
+        'key': ('k1.pdf', 'Box 14A'),
+        'column': 'Marginal NY',
+    },
+    expected_path="cases.marginal.by_input.two_tag_row_ny",
+    use_inputs_index=False,
+    case_inputs=MARGINAL_CASE_INPUTS,
+    case_expected=for_all_years(
+        lambda inputs, policy: rebuilt_marginal_rate(
+            inputs, policy, with_item_shift('k1.pdf', 0), 'Marginal NY'
+        )
+    ),
+)
+
+test_marginal_by_input_repeated_tag = create_test(
+    description="Marginal Table by Input (row repeating its tag, total)",
+    func=marginal_table_value,
+    prepare_args=lambda inputs, policy: {
+        'table': marginal_rate_table_by_input(inputs, policy),
+        'key': ('k1.pdf', 'Box 4a'),
+        'column': 'Marginal Total',
+    },
+    expected_path="cases.marginal.by_input.repeated_tag_total",
+    use_inputs_index=False,
+    case_inputs=MARGINAL_CASE_INPUTS,
+    case_expected=for_all_years(
+        lambda inputs, policy: rebuilt_marginal_rate(
+            inputs, policy, with_item_shift('k1.pdf', 2), 'Marginal Total'
+        )
+    ),
+)
+
+test_marginal_by_input_beside_unparsed_amount = create_test(
+    description="Marginal Table by Input (source with an unparsed amount, total)",
+    func=marginal_table_value,
+    prepare_args=lambda inputs, policy: {
+        'table': marginal_rate_table_by_input(inputs, policy),
+        'key': ('k1.pdf', 'Box 12'),
+        'column': 'Marginal Total',
+    },
+    expected_path="cases.marginal.by_input.beside_unparsed_amount_total",
+    use_inputs_index=False,
+    case_inputs=MARGINAL_CASE_INPUTS,
+    case_expected=for_all_years(
+        lambda inputs, policy: rebuilt_marginal_rate(
+            inputs, policy, with_item_shift('k1.pdf', 1), 'Marginal Total'
+        )
+    ),
+)
+
+test_case_tax_computation_worksheet_first_bracket_floor = create_test(
+    description="Tax Computation Worksheet (first bracket floor)",
+    func=federal_form_1040_tax_computation_worksheet_tax,
+    prepare_args=lambda inputs, policy: {
+        'taxable_income': Decimal(policy['tax_computation_worksheet']['sections'][0]['min']),
+        'policy': policy,
+    },
+    expected_path="cases.federal.tax_computation_worksheet.first_bracket_floor",
+    case_expected={2023: Decimal('12615'), 2024: Decimal('12106')},
+)
+
+test_case_tax_computation_worksheet_first_bracket_ceiling = create_test(
+    description="Tax Computation Worksheet (first bracket ceiling)",
+    func=federal_form_1040_tax_computation_worksheet_tax,
+    prepare_args=lambda inputs, policy: {
+        'taxable_income': Decimal(policy['tax_computation_worksheet']['sections'][0]['max']),
+        'policy': policy,
+    },
+    expected_path="cases.federal.tax_computation_worksheet.first_bracket_ceiling",
+    case_expected={2023: Decimal('32580'), 2024: Decimal('34337')},
+)
+
+test_case_tax_computation_worksheet_second_bracket_floor = create_test(
+    description="Tax Computation Worksheet (second bracket floor)",
+    func=federal_form_1040_tax_computation_worksheet_tax,
+    prepare_args=lambda inputs, policy: {
+        'taxable_income': Decimal(policy['tax_computation_worksheet']['sections'][1]['min']),
+        'policy': policy,
+    },
+    expected_path="cases.federal.tax_computation_worksheet.second_bracket_floor",
+    case_expected={2023: Decimal('32580'), 2024: Decimal('34337')},
+)
+
+test_case_tax_computation_worksheet_top_bracket_floor = create_test(
+    description="Tax Computation Worksheet (top bracket floor)",
+    func=federal_form_1040_tax_computation_worksheet_tax,
+    prepare_args=lambda inputs, policy: {
+        'taxable_income': Decimal(policy['tax_computation_worksheet']['sections'][-1]['min']),
+        'policy': policy,
+    },
+    expected_path="cases.federal.tax_computation_worksheet.top_bracket_floor",
+    case_expected={2023: Decimal('186602'), 2024: Decimal('196670')},
+)
+
+test_case_tax_computation_worksheet_above_top_bracket_floor = create_test(
+    description="Tax Computation Worksheet (10x top bracket floor)",
+    func=federal_form_1040_tax_computation_worksheet_tax,
+    prepare_args=lambda inputs, policy: {
+        'taxable_income': Decimal(policy['tax_computation_worksheet']['sections'][-1]['min']) * 10,
+        'policy': policy,
+    },
+    expected_path="cases.federal.tax_computation_worksheet.above_top_bracket_floor",
+    case_expected={2023: Decimal('2496793'), 2024: Decimal('2631569')},
+)
+
+test_case_ny_statement_2_line_3_first_bracket_floor = create_test(
+    description="NY Statement 2 Line 3 (first bracket floor)",
+    func=ny_it201_statement_2_line_3_tax_from_rate_schedule,
+    prepare_args=lambda inputs, policy: {
+        'line_38_ny_taxable_income': Decimal(policy['ny_nys_tax_rate_schedule'][0]['min']),
+        'policy': policy,
+    },
+    expected_path="cases.ny.statement_2.line_3.first_bracket_floor",
+    case_expected={2023: Decimal('0'), 2024: Decimal('0')},
+)
+
+test_case_ny_statement_2_line_3_shared_boundary = create_test(
+    description="NY Statement 2 Line 3 (boundary shared by first two brackets)",
+    func=ny_it201_statement_2_line_3_tax_from_rate_schedule,
+    prepare_args=lambda inputs, policy: {
+        'line_38_ny_taxable_income': Decimal(policy['ny_nys_tax_rate_schedule'][0]['max']),
+        'policy': policy,
+    },
+    expected_path="cases.ny.statement_2.line_3.shared_boundary",
+    case_expected={2023: Decimal('686'), 2024: Decimal('686')},
+)
+
+test_case_ny_statement_2_line_3_inside_second_bracket = create_test(
+    description="NY Statement 2 Line 3 (inside second bracket)",
+    func=ny_it201_statement_2_line_3_tax_from_rate_schedule,
+    prepare_args=lambda inputs, policy: {
+        'line_38_ny_taxable_income': Decimal(policy['ny_nys_tax_rate_schedule'][1]['min']) + 1000,
+        'policy': policy,
+    },
+    expected_path="cases.ny.statement_2.line_3.inside_second_bracket",
+    case_expected={2023: Decimal('731'), 2024: Decimal('731')},
+)
+
+test_case_ny_statement_2_line_3_top_bracket_floor = create_test(
+    description="NY Statement 2 Line 3 (top bracket floor)",
+    func=ny_it201_statement_2_line_3_tax_from_rate_schedule,
+    prepare_args=lambda inputs, policy: {
+        'line_38_ny_taxable_income': Decimal(policy['ny_nys_tax_rate_schedule'][-1]['min']),
+        'policy': policy,
+    },
+    expected_path="cases.ny.statement_2.line_3.top_bracket_floor",
+    case_expected={2023: Decimal('2478263'), 2024: Decimal('2478263')},
+)
+
+test_case_ny_statement_2_line_3_above_top_bracket_floor = create_test(
+    description="NY Statement 2 Line 3 (10x top bracket floor)",
+    func=ny_it201_statement_2_line_3_tax_from_rate_schedule,
+    prepare_args=lambda inputs, policy: {
+        'line_38_ny_taxable_income': Decimal(policy['ny_nys_tax_rate_schedule'][-1]['min']) * 10,
+        'policy': policy,
+    },
+    expected_path="cases.ny.statement_2.line_3.above_top_bracket_floor",
+    case_expected={2023: Decimal('27003263'), 2024: Decimal('27003263')},
+)
+
+test_case_ny_it201_line_47a_first_bracket_floor = create_test(
+    description="NY IT-201 Line 47a (first bracket floor)",
+    func=ny_it201_line_47a_nyc_resident_tax,
+    prepare_args=lambda inputs, policy: {
+        'line_47_nyc_taxable_income': Decimal(policy['nyc_resident_tax_rate_schedule'][0]['min']),
+        'policy': policy,
+    },
+    expected_path="cases.ny.it_201.line_47a_nyc_resident_tax.first_bracket_floor",
+    case_expected={2023: Decimal('0'), 2024: Decimal('0')},
+)
+
+test_case_ny_it201_line_47a_shared_boundary = create_test(
+    description="NY IT-201 Line 47a (boundary shared by first two brackets)",
+    func=ny_it201_line_47a_nyc_resident_tax,
+    prepare_args=lambda inputs, policy: {
+        'line_47_nyc_taxable_income': Decimal(policy['nyc_resident_tax_rate_schedule'][0]['max']),
+        'policy': policy,
+    },
+    expected_path="cases.ny.it_201.line_47a_nyc_resident_tax.shared_boundary",
+    case_expected={2023: Decimal('665'), 2024: Decimal('665')},
+)
+
+test_case_ny_it201_line_47a_inside_second_bracket = create_test(
+    description="NY IT-201 Line 47a (inside second bracket)",
+    func=ny_it201_line_47a_nyc_resident_tax,
+    prepare_args=lambda inputs, policy: {
+        'line_47_nyc_taxable_income': Decimal(policy['nyc_resident_tax_rate_schedule'][1]['min']) + 1000,
+        'policy': policy,
+    },
+    expected_path="cases.ny.it_201.line_47a_nyc_resident_tax.inside_second_bracket",
+    case_expected={2023: Decimal('703'), 2024: Decimal('703')},
+)
+
+test_case_ny_it201_line_47a_top_bracket_floor = create_test(
+    description="NY IT-201 Line 47a (top bracket floor)",
+    func=ny_it201_line_47a_nyc_resident_tax,
+    prepare_args=lambda inputs, policy: {
+        'line_47_nyc_taxable_income': Decimal(policy['nyc_resident_tax_rate_schedule'][-1]['min']),
+        'policy': policy,
+    },
+    expected_path="cases.ny.it_201.line_47a_nyc_resident_tax.top_bracket_floor",
+    case_expected={2023: Decimal('3264'), 2024: Decimal('3264')},
+)
+
+test_case_ny_it201_line_47a_above_top_bracket_floor = create_test(
+    description="NY IT-201 Line 47a (10x top bracket floor)",
+    func=ny_it201_line_47a_nyc_resident_tax,
+    prepare_args=lambda inputs, policy: {
+        'line_47_nyc_taxable_income': Decimal(policy['nyc_resident_tax_rate_schedule'][-1]['min']) * 10,
+        'policy': policy,
+    },
+    expected_path="cases.ny.it_201.line_47a_nyc_resident_tax.above_top_bracket_floor",
+    case_expected={2023: Decimal('34660'), 2024: Decimal('34660')},
+)
+
+test_case_qdcg_worksheet_line_25_shortcut_with_loss = create_test(
+    description="QDCG Worksheet Line 25 (no dividends, net loss takes the shortcut)",
+    func=federal_form_1040_qualified_dividends_capital_gain_worksheet_line_25,
+    prepare_args=lambda inputs, policy: {
+        'line_1_taxable_income': Decimal('150000'),
+        'line_2_qualified_dividends': Decimal('0'),
+        'schedule_d_line_15': Decimal('0'),
+        'schedule_d_line_16': Decimal('-3000'),
+        'policy': policy,
+    },
+    expected_path="cases.federal.qdcg_worksheet.line_25.shortcut_with_loss",
+    case_expected={2023: Decimal('23615'), 2024: Decimal('23106')},
+)
+
+test_case_qdcg_worksheet_line_25_shortcut_matches_ordinary_tax = create_test(
+    description="QDCG Worksheet Line 25 (shortcut equals ordinary tax on line 1)",
+    func=federal_form_1040_qualified_dividends_capital_gain_worksheet_line_25,
+    prepare_args=lambda inputs, policy: {
+        'line_1_taxable_income': Decimal('150000'),
+        'line_2_qualified_dividends': Decimal('0'),
+        'schedule_d_line_15': Decimal('0'),
+        'schedule_d_line_16': Decimal('0'),
+        'policy': policy,
+    },
+    expected_path="cases.federal.qdcg_worksheet.line_25.shortcut_matches_ordinary_tax",
+    case_expected=for_all_years(
+        lambda inputs, policy: federal_form_1040_tax_computation_worksheet_tax(Decimal('150000'), policy)
+    ),
+)
+
+test_case_qdcg_worksheet_line_25_with_dividends_and_gains = create_test(
+    description="QDCG Worksheet Line 25 (dividends and gains take the full worksheet)",
+    func=federal_form_1040_qualified_dividends_capital_gain_worksheet_line_25,
+    prepare_args=lambda inputs, policy: {
+        'line_1_taxable_income': Decimal('150000'),
+        'line_2_qualified_dividends': Decimal('20000'),
+        'schedule_d_line_15': Decimal('10000'),
+        'schedule_d_line_16': Decimal('5000'),
+        'policy': policy,
+    },
+    expected_path="cases.federal.qdcg_worksheet.line_25.with_dividends_and_gains",
+    case_expected={2023: Decimal('21865'), 2024: Decimal('21356')},
+)
+
+test_case_schedule_d_line_7_carryover_omitted = create_test(
+    description="Schedule D Line 7 (loss carryover omitted)",
+    func=federal_schedule_d_line_7_net_short_term_gain,
+    prepare_args=lambda inputs, policy: {
+        'line_1a_short_term_gain': Decimal('1200'),
+        'line_3_short_term_adjustment': Decimal('-200'),
+        'line_4_short_term_from_6781': Decimal('300'),
+        'line_5_short_term_k1_gain': Decimal('50'),
+    },
+    expected_path="cases.federal.schedule_d.line_7.carryover_omitted",
+    case_expected=for_all_years(Decimal('1350')),
+)
+
+test_case_schedule_d_line_7_carryover_given = create_test(
+    description="Schedule D Line 7 (loss carryover given)",
+    func=federal_schedule_d_line_7_net_short_term_gain,
+    prepare_args=lambda inputs, policy: {
+        'line_1a_short_term_gain': Decimal('1200'),
+        'line_3_short_term_adjustment': Decimal('-200'),
+        'line_4_short_term_from_6781': Decimal('300'),
+        'line_5_short_term_k1_gain': Decimal('50'),
+        'line_6_short_term_loss_carryover': Decimal('-2000'),
+    },
+    expected_path="cases.federal.schedule_d.line_7.carryover_given",
+    case_expected=for_all_years(Decimal('-650')),
+)
+
+test_case_form_8960_line_4b_deductions_omitted = create_test(
+    description="Form 8960 Line 4b (nonpassive deductions omitted)",
+    func=federal_form_8960_line_4b_adjustment_nonsection_1411,
+    prepare_args=lambda inputs, policy: {
+        'nonpassive_income': Decimal('10000.40'),
+    },
+    expected_path="cases.federal.form_8960.line_4b.deductions_omitted",
+    case_expected=for_all_years(Decimal('-10000')),
+)
+
+test_case_form_8960_line_4b_deductions_given = create_test(
+    description="Form 8960 Line 4b (nonpassive deductions given)",
+    func=federal_form_8960_line_4b_adjustment_nonsection_1411,
+    prepare_args=lambda inputs, policy: {
+        'nonpassive_income': Decimal('10000.40'),
+        'nonpassive_losses_allowed': Decimal('1500'),
+        'section_179_deduction': Decimal('2500'),
+        'additional_nonpassive_deductions': Decimal('999.90'),
+    },
+    expected_path="cases.federal.form_8960.line_4b.deductions_given",
+    case_expected=for_all_years(Decimal('-5001')),
+)
+
+test_case_form_8960_line_5d_adjustments_omitted = create_test(
+    description="Form 8960 Line 5d (lines 5b and 5c omitted)",
+    func=federal_form_8960_line_5d_net_gain_loss_disposition,
+    prepare_args=lambda inputs, policy: {
+        'line_5a_net_gain_loss_disposition': Decimal('8000'),
+    },
+    expected_path="cases.federal.form_8960.line_5d.adjustments_omitted",
+    case_expected=for_all_years(Decimal('8000')),
+)
+
+test_case_form_8960_line_5d_adjustments_given = create_test(
+    description="Form 8960 Line 5d (lines 5b and 5c given)",
+    func=federal_form_8960_line_5d_net_gain_loss_disposition,
+    prepare_args=lambda inputs, policy: {
+        'line_5a_net_gain_loss_disposition': Decimal('8000'),
+        'line_5b_gain_not_subject_to_niit': Decimal('-3000'),
+        'line_5c_adjustment_disposition_partnership_interest': Decimal('-500'),
+    },
+    expected_path="cases.federal.form_8960.line_5d.adjustments_given",
+    case_expected=for_all_years(Decimal('4500')),
+)
+
+test_case_form_1040_line_14_qbi_omitted = create_test(
+    description="Form 1040 Line 14 (QBI deduction omitted)",
+    func=federal_form_1040_line_14_total_deductions,
+    prepare_args=lambda inputs, policy: {
+        'line_12_standard_deduction': Decimal('29200'),
+    },
+    expected_path="cases.federal.form_1040.line_14.qbi_omitted",
+    case_expected=for_all_years(Decimal('29200')),
+)
+
+test_case_form_1040_line_14_qbi_given = create_test(
+    description="Form 1040 Line 14 (QBI deduction given)",
+    func=federal_form_1040_line_14_total_deductions,
+    prepare_args=lambda inputs, policy: {
+        'line_12_standard_deduction': Decimal('29200'),
+        'line_13_qbi_deduction': Decimal('1800'),
+    },
+    expected_path="cases.federal.form_1040.line_14.qbi_given",
+    case_expected=for_all_years(Decimal('31000')),
+)
+
+test_case_ny_it201_line_24_additions_omitted = create_test(
+    description="NY IT-201 Line 24 (additions omitted)",
+    func=ny_it201_line_24_ny_total_income,
+    prepare_args=lambda inputs, policy: {
+        'line_19_federal_agi': Decimal('250000'),
+    },
+    expected_path="cases.ny.it_201.line_24_ny_total_income.additions_omitted",
+    case_expected=for_all_years(Decimal('250000')),
+)
+
+test_case_ny_it201_line_24_additions_given = create_test(
+    description="NY IT-201 Line 24 (additions given)",
+    func=ny_it201_line_24_ny_total_income,
+    prepare_args=lambda inputs, policy: {
+        'line_19_federal_agi': Decimal('250000'),
+        'line_21_public_employee_414h': Decimal('4000'),
+        'line_22_ny_529_distributions': Decimal('1500'),
+        'line_23_other_additions': Decimal('250'),
+    },
+    expected_path="cases.ny.it_201.line_24_ny_total_income.additions_given",
+    case_expected=for_all_years(Decimal('255750')),
+)
+
+test_case_form_8960_line_8_optional_lines_omitted = create_test(
+    description="Form 8960 Line 8 (lines 3-7 omitted)",
+    func=federal_form_8960_line_8_total_investment_income,
+    prepare_args=lambda inputs, policy: {
+        'line_1_taxable_interest': Decimal('1200'),
+        'line_2_ordinary_dividends': Decimal('3400'),
+    },
+    expected_path="cases.federal.form_8960.line_8.optional_lines_omitted",
+    case_expected=for_all_years(Decimal('4600')),
+)
+
+test_case_form_8960_line_8_optional_lines_given = create_test(
+    description="Form 8960 Line 8 (lines 3-7 given)",
+    func=federal_form_8960_line_8_total_investment_income,
+    prepare_args=lambda inputs, policy: {
+        'line_1_taxable_interest': Decimal('1200'),
+        'line_2_ordinary_dividends': Decimal('3400'),
+        'line_3_annuities': Decimal('500'),
+        'line_4c_net_income_from_rentals': Decimal('-700'),
+        'line_5d_net_gain_loss_disposition': Decimal('9000'),
+        'line_6_adjustments_cfc_pfic': Decimal('100'),
+        'line_7_other_modifications': Decimal('-50'),
+    },
+    expected_path="cases.federal.form_8960.line_8.optional_lines_given",
+    case_expected=for_all_years(Decimal('13450')),
+)
+
+test_case_schedule_2_line_21_all_omitted = create_test(
+    description="Schedule 2 Line 21 (all lines omitted)",
+    func=federal_schedule_2_line_21_other_taxes,
+    prepare_args=lambda inputs, policy: {},
+    expected_path="cases.federal.schedule_2.line_21.all_omitted",
+    case_expected=for_all_years(Decimal('0')),
+)
+
+test_case_schedule_2_line_21_some_given = create_test(
+    description="Schedule 2 Line 21 (medicare and NIIT given)",
+    func=federal_schedule_2_line_21_other_taxes,
+    prepare_args=lambda inputs, policy: {
+        'line_11_additional_medicare_tax': Decimal('850'),
+        'line_12_net_investment_income_tax': Decimal('1520'),
+    },
+    expected_path="cases.federal.schedule_2.line_21.some_given",
+    case_expected=for_all_years(Decimal('2370')),
+)
+
+test_case_form_1040_line_21_credits_omitted = create_test(
+    description="Form 1040 Line 21 (credits omitted)",
+    func=federal_form_1040_line_21_total_credits,
+    prepare_args=lambda inputs, policy: {},
+    expected_path="cases.federal.form_1040.line_21.credits_omitted",
+    case_expected=for_all_years(Decimal('0')),
+)
+
+test_case_form_1040_line_21_credits_given = create_test(
+    description="Form 1040 Line 21 (credits given)",
+    func=federal_form_1040_line_21_total_credits,
+    prepare_args=lambda inputs, policy: {
+        'line_19_child_tax_credit': Decimal('2000'),
+        'line_20_schedule_3_line_8': Decimal('315'),
+    },
+    expected_path="cases.federal.form_1040.line_21.credits_given",
+    case_expected=for_all_years(Decimal('2315')),
+)
+
+
+def test_tag_total_unparseable_amount():
+    """A tag with a non-numeric Amount raises when read, rounded or not."""
+    index = build_inputs_index({
+        'source': [
+            {'Tags': ['bad_tag'], 'Amount': '100'},
+            {'Tags': ['bad_tag'], 'Amount': 'n/a'},
+            {'Tags': ['good_tag'], 'Amount': '5.5'},
+        ],
+    })
+    for round_each in (False, True):
+        with pytest.raises(InvalidOperation):
+            tag_total(index, 'bad_tag', round_each=round_each)
+    # Other tags in the same index are unaffected.
+    assert tag_total(index, 'good_tag') == Decimal('5.5')
+    assert tag_total(index, 'good_tag', round_each=True) == Decimal('6')
+
+
+
+def test_policy_cache_needs_clear_after_in_place_edit():
+    """
+    Policy values are cached per policy dict: an in-place edit is not seen
+    until clear_policy_cache() is called.
+    """
+    policy = load_policy(YEARS[-1])
+    income = Decimal('150000')
+    deduction = federal_form_1040_line_12_standard_deduction(policy)
+    worksheet_tax = federal_form_1040_tax_computation_worksheet_tax(income, policy)
+
+    policy['standard_deduction'] = str(deduction + 1000)
+    policy['tax_computation_worksheet']['sections'][0]['subtract_amount'] = '0'
+    assert federal_form_1040_line_12_standard_deduction(policy) == deduction
+    assert federal_form_1040_tax_computation_worksheet_tax(income, policy) == worksheet_tax
+
+    clear_policy_cache()
+    assert federal_form_1040_line_12_standard_deduction(policy) == deduction + 1000
+    rate = Decimal(policy['tax_computation_worksheet']['sections'][0]['rate'])
+    assert federal_form_1040_tax_computation_worksheet_tax(income, policy) == round_to_dollars(
+        income * rate
+    )
+
+
+def test_marginal_tables_leave_inputs_unmodified():
+    """The marginal tables perturb copies; the caller's inputs must not change."""
+    snapshot = json.dumps(MARGINAL_CASE_INPUTS, sort_keys=True)
+    for year in YEARS:
+        policy = load_policy(year)
+        marginal_rate_table_by_input(MARGINAL_CASE_INPUTS, policy)
+        marginal_rate_table_by_tag(MARGINAL_CASE_INPUTS, policy)
+        assert json.dumps(MARGINAL_CASE_INPUTS, sort_keys=True) == snapshot, year
+
+
 if __name__ == '__main__':
     print("Running expected-value tests across years...\n")
     test_expected_values()
+    test_fixed_cases()
     print("\nAll tests passed!")